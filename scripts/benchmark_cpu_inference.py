@@ -0,0 +1,157 @@
+"""Benchmark CPU-targeted inference optimizations of a trained policy.
+
+Observations are collected from headless rollouts of the fp32 policy. Then,
+each configuration predicts action chunks for the same observations, and its
+per-chunk latency and action deviation from the fp32 baseline are reported.
+
+Usage:
+    python scripts/benchmark_cpu_inference.py \
+        --policy_path outputs/train/gym_hil_trial/checkpoints/last/pretrained_model \
+        --num_threads "[1,4]"
+"""
+
+import itertools
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+from lerobot.configs import parser
+from lerobot.datasets.utils import build_dataset_frame
+from lerobot.processor import RobotAction, RobotObservation
+from lerobot.utils.utils import init_logging
+
+from lerobot_trial.cpu_inference import CpuInferenceConfig
+from lerobot_trial.gym_hil import make_env
+from lerobot_trial.hw_impl.gym_hil_evaluator import GymHILEvaluatorRobot
+from lerobot_trial.policy import PolicyController, load_policy, make_policy_batch
+from lerobot_trial.rollout import make_dataset_features, run_episode
+
+
+@dataclass
+class BenchmarkCpuInferenceConfig:
+    policy_path: str
+    num_observations: int = 50
+    num_warmup: int = 5  # Also absorbs compilation time of `torch.compile`.
+    seed: int = 0
+    max_steps: int = 300
+    single_task: str = "Pick up a cube"
+    # Thread counts to try; all cores if empty.
+    num_threads: list[int] = field(default_factory=list)
+
+
+@dataclass
+class BenchmarkResult:
+    latencies: list[float]
+    chunks: list[torch.Tensor]
+
+
+def collect_observation_frames(
+    cfg: BenchmarkCpuInferenceConfig, features: dict[str, dict[str, Any]]
+) -> list[dict[str, Any]]:
+    env = make_env(headless=True)
+    controller = PolicyController(
+        model_dir=Path(cfg.policy_path),
+        device="cpu",
+        dataset_features=features,
+        task=cfg.single_task,
+        robot_type=GymHILEvaluatorRobot.name,
+    )
+
+    frames: list[dict[str, Any]] = []
+
+    def on_step(observation: RobotObservation, _action: RobotAction) -> None:
+        if len(frames) < cfg.num_observations:
+            frames.append(
+                build_dataset_frame(features, observation, prefix="observation")
+            )
+
+    seed = cfg.seed
+    while len(frames) < cfg.num_observations:
+        run_episode(env, controller, seed, cfg.max_steps, on_step=on_step)
+        seed += 1
+
+    env.close()
+    return frames
+
+
+def benchmark(
+    cfg: BenchmarkCpuInferenceConfig,
+    cpu_inference: CpuInferenceConfig,
+    frames: list[dict[str, Any]],
+) -> BenchmarkResult:
+    policy, preprocessor, postprocessor = load_policy(
+        Path(cfg.policy_path), "cpu", cpu_inference
+    )
+    batches = [
+        preprocessor(make_policy_batch(f, cfg.single_task, GymHILEvaluatorRobot.name))
+        for f in frames
+    ]
+
+    result = BenchmarkResult(latencies=[], chunks=[])
+    with torch.inference_mode():
+        for batch in batches[: cfg.num_warmup]:
+            policy.predict_action_chunk(batch)
+
+        for batch in batches:
+            start = time.perf_counter()
+            chunk = policy.predict_action_chunk(batch)
+            result.latencies.append(time.perf_counter() - start)
+            result.chunks.append(postprocessor(chunk))
+
+    return result
+
+
+@parser.wrap()  # type: ignore[misc]
+def main(cfg: BenchmarkCpuInferenceConfig) -> None:
+    init_logging()
+
+    env = make_env(headless=True)
+    features = make_dataset_features(env)
+    env.close()
+
+    frames = collect_observation_frames(cfg, features)
+
+    all_threads = os.cpu_count() or 1
+    baseline_config = CpuInferenceConfig(num_threads=all_threads)
+    baseline = benchmark(cfg, baseline_config, frames)
+
+    configs = [
+        CpuInferenceConfig(quantize=q, compile=c, num_threads=t)
+        for t in cfg.num_threads or [all_threads]
+        for q, c in itertools.product([False, True], repeat=2)
+    ]
+    # The baseline has already been measured above.
+    configs = [config for config in configs if config != baseline_config]
+
+    print(
+        f"{'configuration':<50} {'mean ms':>8} {'p95 ms':>8} "
+        f"{'mean dev':>9} {'max dev':>9}"
+    )
+    for config in [baseline_config, *configs]:
+        try:
+            result = (
+                baseline
+                if config is baseline_config
+                else benchmark(cfg, config, frames)
+            )
+        except Exception as e:  # e.g., compilation of quantized layers
+            print(f"{str(config):<50} failed: {e}")
+            continue
+
+        deviations = torch.stack(
+            [(c - b).abs() for c, b in zip(result.chunks, baseline.chunks)]
+        )
+        latencies = np.array(result.latencies) * 1e3
+        print(
+            f"{str(config):<50} {latencies.mean():>8.2f} "
+            f"{np.percentile(latencies, 95):>8.2f} "
+            f"{deviations.mean().item():>9.2e} {deviations.max().item():>9.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Benchmark startup of the nodes: import time and time to the first message.
+
+Import time is measured by importing each node script in a fresh interpreter,
+along with the top-level packages that take the longest to import. Time to the
+first message is measured by launching a dataflow, in which each node reports
+when it handles its first message (see `lerobot_trial.startup`).
+
+Usage:
+    python scripts/benchmark_startup.py --dataflow dataflow-record.yaml
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+from lerobot.configs import parser
+
+from lerobot_trial.startup import STARTUP_REPORT_ENV
+
+NODE_SCRIPTS = {
+    "keyboard": "src/nodes/run_keyboard.py",
+    "gym-hil": "src/nodes/run_gym_hil.py",
+    "lerobot": "src/nodes/record_by_lerobot.py",
+}
+
+# Executes top-level imports of a node script without running its `main`.
+IMPORT_SNIPPET = (
+    "import runpy, sys, time; start = time.perf_counter(); "
+    "runpy.run_path(sys.argv[1], run_name='startup_benchmark'); "
+    "print(time.perf_counter() - start)"
+)
+
+
+@dataclass
+class BenchmarkStartupConfig:
+    num_repeats: int = 3
+    num_top_imports: int = 5
+    # Dataflow to measure time to the first message; skipped if empty.
+    dataflow: str = "dataflow-record.yaml"
+    timeout_s: float = 120.0
+
+
+def measure_import_secs(script: str, num_repeats: int) -> float:
+    """Returns the fastest of repeated imports, which suffers the least noise."""
+
+    secs = []
+    for _ in range(num_repeats):
+        proc = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET, script],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        secs.append(float(proc.stdout.strip().splitlines()[-1]))
+    return min(secs)
+
+
+def profile_top_imports(script: str, num_top: int) -> list[tuple[str, float]]:
+    """Returns top-level packages by cumulative import time in seconds."""
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET, script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative: dict[str, float] = defaultdict(float)
+    for line in proc.stderr.splitlines():
+        # e.g., "import time:       123 |       4567 |   numpy.core"
+        if not line.startswith("import time:"):
+            continue
+        _self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not cumulative_us.strip().isdigit() or name[1:].startswith(" "):
+            continue  # Header or nested import
+        cumulative[name.strip().split(".")[0]] += int(cumulative_us) * 1e-6
+
+    return sorted(cumulative.items(), key=lambda kv: kv[1], reverse=True)[:num_top]
+
+
+def measure_first_message_secs(
+    dataflow: Path, timeout_s: float
+) -> dict[str, float | None]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_path = Path(tmp_dir) / "startup.jsonl"
+        env = {**os.environ, STARTUP_REPORT_ENV: str(report_path)}
+
+        # Node paths are relative to the dataflow, so place the copy next to it.
+        benchmark_dataflow = dataflow.with_name(f".startup_{dataflow.name}")
+        _write_benchmark_dataflow(dataflow, benchmark_dataflow, Path(tmp_dir))
+
+        launched = time.time()
+        proc = subprocess.Popen(["dora", "run", str(benchmark_dataflow)], env=env)
+        try:
+            while time.time() - launched < timeout_s and proc.poll() is None:
+                if _read_reports(report_path).keys() >= NODE_SCRIPTS.keys():
+                    break
+                time.sleep(0.1)
+        finally:
+            proc.send_signal(signal.SIGINT)  # Let Dora stop the nodes.
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            benchmark_dataflow.unlink()
+
+        reports = _read_reports(report_path)
+
+    return {
+        node: reports[node] - launched if node in reports else None
+        for node in NODE_SCRIPTS
+    }
+
+
+def _write_benchmark_dataflow(src: Path, dst: Path, tmp_dir: Path) -> None:
+    """Copies a dataflow, recording into a temporary dataset not to clobber one."""
+
+    with open(src) as f:
+        dataflow = yaml.safe_load(f)
+
+    for node in dataflow["nodes"]:
+        if node["id"] == "lerobot":
+            args = node.get("args", "").strip()
+            node["args"] = f"{args} --dataset.root={tmp_dir / 'dataset'}"
+
+    with open(dst, "w") as f:
+        yaml.safe_dump(dataflow, f, sort_keys=False)
+
+
+def _read_reports(report_path: Path) -> dict[str, float]:
+    if not report_path.exists():
+        return {}
+
+    with open(report_path) as f:
+        reports = [json.loads(line) for line in f if line.strip()]
+    return {r["node"]: r["time"] for r in reports}
+
+
+@parser.wrap()  # type: ignore[misc]
+def main(cfg: BenchmarkStartupConfig) -> None:
+    for node, script in NODE_SCRIPTS.items():
+        secs = measure_import_secs(script, cfg.num_repeats)
+        top_imports = profile_top_imports(script, cfg.num_top_imports)
+        print(f"{node}: import {secs:.3f} secs")
+        for name, cumulative_secs in top_imports:
+            print(f"  {name:<30} {cumulative_secs:>7.3f} secs")
+
+    if not cfg.dataflow:
+        return
+
+    first_message_secs = measure_first_message_secs(Path(cfg.dataflow), cfg.timeout_s)
+    for node, message_secs in first_message_secs.items():
+        result = "no message" if message_secs is None else f"{message_secs:.3f} secs"
+        print(f"{node}: first message {result} after launch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Pre-decode camera streams of a recorded dataset into a memory-mapped cache.
+
+Usage:
+    python scripts/build_frame_cache.py \
+        --repo_id example/gym_hil_trial \
+        --root outputs/record/gym_hil_trial
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from lerobot.configs import parser
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.utils.utils import init_logging
+
+from lerobot_trial.frame_cache import default_frame_cache_dir, load_or_build_frame_cache
+
+
+@dataclass
+class BuildFrameCacheConfig:
+    repo_id: str
+    root: str
+    cache_dir: str | None = None  # Defaults to `<root>_frame_cache`.
+
+
+@parser.wrap()  # type: ignore[misc]
+def main(cfg: BuildFrameCacheConfig) -> None:
+    init_logging()
+
+    dataset = LeRobotDataset(repo_id=cfg.repo_id, root=cfg.root)
+    cache_dir = Path(cfg.cache_dir or default_frame_cache_dir(cfg.root))
+
+    cache = load_or_build_frame_cache(dataset, cache_dir)
+    print(f"Frame cache is ready at {cache.cache_dir}: {cache.shapes}")
+
+
+if __name__ == "__main__":
+    main()
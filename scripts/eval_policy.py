@@ -0,0 +1,186 @@
+"""Evaluate a trained policy in parallel headless Gym-HIL environments.
+
+Usage:
+    python scripts/eval_policy.py \
+        --policy_path outputs/train/gym_hil_trial/checkpoints/last/pretrained_model \
+        --num_episodes 20 --num_workers 4
+"""
+
+import json
+import logging
+import shutil
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import torch
+from lerobot.configs import parser
+from lerobot.processor import RobotAction, RobotObservation
+from lerobot.utils.io_utils import write_video
+from lerobot.utils.utils import init_logging
+
+from lerobot_trial.config import COMMON_CONFIG
+from lerobot_trial.cpu_inference import CpuInferenceConfig
+from lerobot_trial.gym_hil import make_env
+from lerobot_trial.hw_impl.gym_hil_evaluator import GymHILEvaluatorRobot
+from lerobot_trial.policy import PolicyController
+from lerobot_trial.rollout import (
+    EpisodeResult,
+    add_dataset_frame,
+    create_dataset,
+    dataset_shard_root,
+    make_dataset_features,
+    merge_dataset_shards,
+    run_episode,
+    run_workers,
+    split_seeds,
+)
+
+
+@dataclass
+class EvalPolicyConfig:
+    policy_path: str
+    num_episodes: int = 10
+    num_workers: int = 4
+    seed: int = 0  # Episode `i` uses `seed + i`.
+    max_steps: int = 300  # Episodes not succeeding within this are failures.
+    device: str = "cpu"
+    torch_threads: int = 1  # Per worker, to avoid oversubscribing cores.
+    single_task: str = "Pick up a cube"
+    output_dir: str = "outputs/eval/headless"
+    save_videos: bool = False
+    video_key: str = "front"
+    record_dataset: bool = False
+    dataset_repo_id: str = "example/eval_gym_hil_trial"
+    cpu_inference: CpuInferenceConfig = field(default_factory=CpuInferenceConfig)
+
+
+def eval_worker(
+    cfg: EvalPolicyConfig, worker_index: int, seeds: list[int]
+) -> list[EpisodeResult]:
+    torch.set_num_threads(cfg.torch_threads)
+
+    output_dir = Path(cfg.output_dir)
+    env = make_env(headless=True)
+    features = make_dataset_features(env)
+    controller = PolicyController(
+        model_dir=Path(cfg.policy_path),
+        device=cfg.device,
+        dataset_features=features,
+        task=cfg.single_task,
+        robot_type=GymHILEvaluatorRobot.name,
+        cpu_inference=cfg.cpu_inference,
+    )
+
+    dataset = (
+        create_dataset(
+            repo_id=cfg.dataset_repo_id,
+            root=dataset_shard_root(output_dir / "dataset", worker_index),
+            features=features,
+            robot_type=GymHILEvaluatorRobot.name,
+        )
+        if cfg.record_dataset
+        else None
+    )
+
+    results = []
+    for seed in seeds:
+        frames: list[np.ndarray] = []
+
+        def on_step(observation: RobotObservation, action: RobotAction) -> None:
+            if dataset is not None:
+                add_dataset_frame(dataset, observation, action, cfg.single_task)
+            if cfg.save_videos:
+                frames.append(observation[cfg.video_key])
+
+        result = run_episode(env, controller, seed, cfg.max_steps, on_step=on_step)
+        results.append(result)
+
+        if dataset is not None:
+            dataset.save_episode()
+        if cfg.save_videos:
+            video_path = output_dir / "videos" / f"seed_{seed:06d}.mp4"
+            video_path.parent.mkdir(parents=True, exist_ok=True)
+            write_video(str(video_path), np.stack(frames), fps=COMMON_CONFIG.fps)
+
+        logging.info(
+            f"[worker {worker_index}] {seed=}: "
+            f"success={result.success}, length={result.length}"
+        )
+
+    if dataset is not None:
+        dataset.finalize()
+    env.close()
+
+    return results
+
+
+def summarize(results: list[EpisodeResult]) -> dict[str, float]:
+    lengths = np.array([r.length for r in results])
+    inference_times = np.concatenate([r.inference_times for r in results])
+    sim_times = np.concatenate([r.sim_times for r in results])
+    return {
+        "num_episodes": len(results),
+        "success_rate": float(np.mean([r.success for r in results])),
+        "episode_length_mean": float(lengths.mean()),
+        "episode_length_max": int(lengths.max()),
+        "inference_ms_mean": float(inference_times.mean() * 1e3),
+        "inference_ms_p95": float(np.percentile(inference_times, 95) * 1e3),
+        "sim_ms_mean": float(sim_times.mean() * 1e3),
+        "sim_ms_p95": float(np.percentile(sim_times, 95) * 1e3),
+    }
+
+
+@parser.wrap()  # type: ignore[misc]
+def main(cfg: EvalPolicyConfig) -> None:
+    init_logging()
+
+    output_dir = Path(cfg.output_dir)
+    dataset_root = output_dir / "dataset"
+    shards_dir = dataset_shard_root(dataset_root, 0).parent
+    if cfg.record_dataset and dataset_root.exists():
+        raise RuntimeError(f"Dataset path already exists: {dataset_root}")
+    if cfg.record_dataset and shards_dir.exists():
+        raise RuntimeError(
+            f"Dataset shards are left by an interrupted run. Remove {shards_dir}."
+        )
+
+    worker_seeds = split_seeds(cfg.seed, cfg.num_episodes, cfg.num_workers)
+    logging.info(
+        f"Evaluating {cfg.num_episodes} episodes with {len(worker_seeds)} workers..."
+    )
+
+    worker_results = run_workers(partial(eval_worker, cfg), worker_seeds)
+    results = sorted((r for rs in worker_results for r in rs), key=lambda r: r.seed)
+
+    for r in results:
+        print(f"seed={r.seed:6d}  success={int(r.success)}  length={r.length:4d}")
+
+    summary = summarize(results)
+    for key, val in summary.items():
+        print(f"{key}: {val:.4g}")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "results.json", "w") as f:
+        json.dump(
+            {
+                "config": asdict(cfg),
+                "summary": summary,
+                "episodes": [asdict(r) for r in results],
+            },
+            f,
+            indent=2,
+        )
+
+    if cfg.record_dataset:
+        shard_roots = [
+            dataset_shard_root(dataset_root, i) for i in range(len(worker_seeds))
+        ]
+        merge_dataset_shards(shard_roots, cfg.dataset_repo_id, dataset_root)
+        logging.info(f"Recorded episodes merged into {dataset_root}")
+        shutil.rmtree(shards_dir)
+
+
+if __name__ == "__main__":
+    main()
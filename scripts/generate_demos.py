@@ -0,0 +1,126 @@
+"""Generate demonstrations by a scripted expert in parallel headless environments.
+
+Episodes are recorded with the same features as `GymHILRecorderRobot`, so the
+resulting dataset can be used (or merged) like one recorded by teleoperation.
+
+Usage:
+    python scripts/generate_demos.py --num_episodes 1000 --num_workers 8
+"""
+
+import logging
+import shutil
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+from lerobot.configs import parser
+from lerobot.processor import RobotAction, RobotObservation
+from lerobot.utils.utils import init_logging
+
+from lerobot_trial.expert import ExpertConfig, ScriptedPickController
+from lerobot_trial.gym_hil import make_env
+from lerobot_trial.hw_impl.gym_hil_recorder import GymHILRecorderRobot
+from lerobot_trial.rollout import (
+    EpisodeResult,
+    add_dataset_frame,
+    create_dataset,
+    dataset_shard_root,
+    make_dataset_features,
+    merge_dataset_shards,
+    run_episode,
+    run_workers,
+    split_seeds,
+)
+
+
+@dataclass
+class GenerateDemosConfig:
+    num_episodes: int = 100
+    num_workers: int = 4
+    seed: int = 0  # Episode `i` uses `seed + i`.
+    max_steps: int = 300  # Episodes not succeeding within this are discarded.
+    single_task: str = "Pick up a cube"
+    repo_id: str = "example/gym_hil_trial_scripted"
+    root: str = "outputs/generate/gym_hil_trial_scripted"
+    keep_failures: bool = False
+    image_writer_threads: int = 4  # Per worker
+    expert: ExpertConfig = field(default_factory=ExpertConfig)
+
+
+def generate_worker(
+    cfg: GenerateDemosConfig, worker_index: int, seeds: list[int]
+) -> list[EpisodeResult]:
+    env = make_env(headless=True)
+    controller = ScriptedPickController(env, cfg.expert)
+    dataset = create_dataset(
+        repo_id=cfg.repo_id,
+        root=dataset_shard_root(Path(cfg.root), worker_index),
+        features=make_dataset_features(env),
+        robot_type=GymHILRecorderRobot.name,
+        image_writer_threads=cfg.image_writer_threads,
+    )
+
+    def on_step(observation: RobotObservation, action: RobotAction) -> None:
+        add_dataset_frame(dataset, observation, action, cfg.single_task)
+
+    results = []
+    for seed in seeds:
+        result = run_episode(env, controller, seed, cfg.max_steps, on_step=on_step)
+        results.append(result)
+
+        if result.success or cfg.keep_failures:
+            dataset.save_episode()
+        else:
+            dataset.clear_episode_buffer()
+
+        logging.info(
+            f"[worker {worker_index}] {seed=}: "
+            f"success={result.success}, length={result.length}"
+        )
+
+    dataset.finalize()
+    env.close()
+
+    return results
+
+
+@parser.wrap()  # type: ignore[misc]
+def main(cfg: GenerateDemosConfig) -> None:
+    init_logging()
+
+    root = Path(cfg.root)
+    shards_dir = dataset_shard_root(root, 0).parent
+    if root.exists():
+        raise RuntimeError(f"Dataset path already exists: {root}")
+    if shards_dir.exists():
+        raise RuntimeError(
+            f"Dataset shards are left by an interrupted run. Remove {shards_dir}."
+        )
+
+    worker_seeds = split_seeds(cfg.seed, cfg.num_episodes, cfg.num_workers)
+    logging.info(
+        f"Generating {cfg.num_episodes} episodes with {len(worker_seeds)} workers..."
+    )
+
+    worker_results = run_workers(partial(generate_worker, cfg), worker_seeds)
+
+    # Shards without any saved episode cannot be merged.
+    shard_roots = []
+    for i, results in enumerate(worker_results):
+        if cfg.keep_failures or any(r.success for r in results):
+            shard_roots.append(dataset_shard_root(root, i))
+        else:
+            shutil.rmtree(dataset_shard_root(root, i))
+
+    results = [r for rs in worker_results for r in rs]
+    num_successes = sum(r.success for r in results)
+    print(f"Succeeded in {num_successes} of {len(results)} episodes.")
+
+    if shard_roots:
+        merge_dataset_shards(shard_roots, cfg.repo_id, root)
+        logging.info(f"Generated episodes merged into {root}")
+    shutil.rmtree(shards_dir)
+
+
+if __name__ == "__main__":
+    main()
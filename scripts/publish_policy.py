@@ -2,60 +2,266 @@
 """
 Script to publish trained models to HuggingFace Hub.
 
+Only files changed since the last publish to the same repository are uploaded,
+based on content hashes recorded in `.publish_manifest.json` in the model dir.
+
 Usage:
     python scripts/publish_policy.py outputs/train/pretrained_model
+
+    # Publish into a local directory standing in for the Hub, e.g., to try out
+    python scripts/publish_policy.py outputs/train/pretrained_model \
+        --local_hub_dir outputs/local_hub
 """
 
+import hashlib
+import json
+import os
+import shutil
 from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatch
+from importlib.resources import files
 from pathlib import Path
+from typing import Protocol
 
-from huggingface_hub import HfApi
+from huggingface_hub import CommitOperationAdd, HfApi, ModelCard, ModelCardData
 from lerobot.configs.policies import PreTrainedConfig
 from lerobot.configs.train import TrainPipelineConfig
-from lerobot.policies.factory import get_policy_class
 
+MANIFEST_FILE = ".publish_manifest.json"
+ALLOW_PATTERNS = ["*.safetensors", "*.json", "*.yaml", "*.md"]
+IGNORE_PATTERNS = ["*.tmp", "*.log", ".*"]
+
+
+class UploadClient(Protocol):
+    def create_repo(self, repo_id: str, private: bool) -> None: ...
+
+    def upload_files(
+        self, repo_id: str, model_dir: Path, paths: list[str], commit_message: str
+    ) -> str:
+        """Uploads files at `paths` relative to `model_dir` and returns a URL."""
+        ...
+
+    def repo_url(self, repo_id: str) -> str: ...
+
+
+class HubUploadClient:
+    def __init__(self) -> None:
+        self._api = HfApi()
+
+    def create_repo(self, repo_id: str, private: bool) -> None:
+        self._api.create_repo(repo_id=repo_id, private=private, exist_ok=True)
+
+    def upload_files(
+        self, repo_id: str, model_dir: Path, paths: list[str], commit_message: str
+    ) -> str:
+        commit_info = self._api.create_commit(
+            repo_id=repo_id,
+            repo_type="model",
+            operations=[
+                CommitOperationAdd(path_in_repo=p, path_or_fileobj=model_dir / p)
+                for p in paths
+            ],
+            commit_message=commit_message,
+        )
+        return str(commit_info.commit_url)
+
+    def repo_url(self, repo_id: str) -> str:
+        return f"https://huggingface.co/{repo_id}"
+
+
+class LocalUploadClient:
+    """Stand-in for the Hub, which copies files into `<root>/<repo_id>`."""
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    def create_repo(self, repo_id: str, private: bool) -> None:
+        (self._root / repo_id).mkdir(parents=True, exist_ok=True)
+
+    def upload_files(
+        self, repo_id: str, model_dir: Path, paths: list[str], commit_message: str
+    ) -> str:
+        for p in paths:
+            dst = self._root / repo_id / p
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(model_dir / p, dst)
+        return self.repo_url(repo_id)
+
+    def repo_url(self, repo_id: str) -> str:
+        return (self._root / repo_id).resolve().as_uri()
+
+
+@dataclass
+class FileEntry:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass
+class Manifest:
+    files: dict[str, FileEntry]
+    # Hashes of files last uploaded per repository
+    uploaded: dict[str, dict[str, str]]
+
+    @classmethod
+    def load(cls, model_dir: Path) -> "Manifest":
+        path = model_dir / MANIFEST_FILE
+        if not path.exists():
+            return cls(files={}, uploaded={})
+
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            files={k: FileEntry(**v) for k, v in data["files"].items()},
+            uploaded=data["uploaded"],
+        )
+
+    def save(self, model_dir: Path) -> None:
+        tmp_path = model_dir / (MANIFEST_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "files": {k: asdict(v) for k, v in self.files.items()},
+                    "uploaded": self.uploaded,
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, model_dir / MANIFEST_FILE)
+
+
+def generate_model_card(config: PreTrainedConfig, dataset_repo_id: str) -> ModelCard:
+    """
+    Generate a model card from config metadata, without loading the weights.
+
+    This mirrors `PreTrainedPolicy.generate_model_card` of LeRobot.
+
+    Args:
+        config: Config of the trained policy
+        dataset_repo_id: Repository ID of the dataset used for training
+    """
+    card_data = ModelCardData(
+        license=config.license or "apache-2.0",
+        library_name="lerobot",
+        pipeline_tag="robotics",
+        tags=sorted(set(config.tags or []).union({"robotics", "lerobot", config.type})),
+        model_name=config.type,
+        datasets=dataset_repo_id,
+        base_model="lerobot/smolvla_base" if config.type == "smolvla" else None,
+    )
+    template = (
+        files("lerobot.templates")
+        .joinpath("lerobot_modelcard_template.md")
+        .read_text(encoding="utf-8")
+    )
+    card = ModelCard.from_template(card_data, template_str=template)
+    card.validate()
+    return card
 
-def publish_model_to_hub(model_dir: Path) -> None:
+
+def list_publishable_files(model_dir: Path) -> list[str]:
+    paths = []
+    for path in sorted(model_dir.rglob("*")):
+        rel = path.relative_to(model_dir).as_posix()
+        if (
+            path.is_file()
+            and any(fnmatch(rel, p) for p in ALLOW_PATTERNS)
+            and not any(fnmatch(path.name, p) for p in IGNORE_PATTERNS)
+        ):
+            paths.append(rel)
+    return paths
+
+
+def hash_files(
+    model_dir: Path, paths: list[str], cached: dict[str, FileEntry]
+) -> dict[str, FileEntry]:
+    """
+    Compute content hashes in parallel, reusing ones of files unchanged on disk.
+
+    Args:
+        model_dir: Path to the directory containing the files
+        paths: Paths of the files relative to `model_dir`
+        cached: Entries computed previously, e.g., by the last publish
+    """
+
+    def hash_file(rel: str) -> FileEntry:
+        stat = (model_dir / rel).stat()
+        entry = cached.get(rel)
+        on_disk = (stat.st_size, stat.st_mtime_ns)
+        if entry is not None and (entry.size, entry.mtime_ns) == on_disk:
+            return entry
+
+        with open(model_dir / rel, "rb") as f:
+            # Hashing releases the GIL, so threads run in parallel.
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        return FileEntry(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=digest)
+
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+        return dict(zip(paths, pool.map(hash_file, paths)))
+
+
+def publish_model_to_hub(
+    model_dir: Path, client: UploadClient, force: bool = False
+) -> None:
     """
     Publish a trained model to HuggingFace Hub.
 
     Args:
         model_dir: Path to the directory containing the trained model files
+        client: Client to upload files, e.g., to HuggingFace Hub
+        force: Upload all files even if unchanged since the last publish
     """
     model_dir = Path(model_dir)
 
     config = PreTrainedConfig.from_pretrained(model_dir)
     train_config = TrainPipelineConfig.from_pretrained(model_dir)
-    policy = get_policy_class(config.type).from_pretrained(model_dir, config=config)
 
     repo_id = config.repo_id
     print(f"Publishing model to HuggingFace Hub: {repo_id}")
 
-    api = HfApi()
-    repo_url = api.create_repo(repo_id=repo_id, private=config.private, exist_ok=True)
-    print(f"Repository created/accessed: {repo_url.repo_id}")
+    client.create_repo(repo_id=repo_id, private=bool(config.private))
+    print(f"Repository created/accessed: {repo_id}")
 
     print("Generating model card...")
-    card = policy.generate_model_card(
-        train_config.dataset.repo_id,
-        model_type=config.type,
-        license=config.license,
-        tags=config.tags,
-    )
+    card = generate_model_card(config, train_config.dataset.repo_id)
     card.save(model_dir / "README.md")
 
+    print("Computing content hashes...")
+    manifest = Manifest.load(model_dir)
+    manifest.files = hash_files(
+        model_dir, list_publishable_files(model_dir), manifest.files
+    )
+
+    uploaded: dict[str, str] = {} if force else manifest.uploaded.get(repo_id, {})
+    changed = [
+        p for p, entry in manifest.files.items() if uploaded.get(p) != entry.sha256
+    ]
+    print(f"{len(changed)} of {len(manifest.files)} files changed: {changed}")
+
+    if not changed:
+        manifest.save(model_dir)
+        print(f"✅ Model is already up to date at {client.repo_url(repo_id)}")
+        return
+
     print("Uploading to HuggingFace Hub...")
-    commit_info = api.upload_folder(
-        repo_id=repo_id,
-        repo_type="model",
-        folder_path=model_dir,
+    commit_url = client.upload_files(
+        repo_id,
+        model_dir,
+        changed,
         commit_message="Upload policy weights, configs and model card",
-        allow_patterns=["*.safetensors", "*.json", "*.yaml", "*.md"],
-        ignore_patterns=["*.tmp", "*.log"],
     )
 
-    print(f"✅ Model successfully pushed to {commit_info.commit_url}")
-    print(f"🔗 View your model at: https://huggingface.co/{repo_id}")
+    manifest.uploaded[repo_id] = {
+        **uploaded,
+        **{p: manifest.files[p].sha256 for p in changed},
+    }
+    manifest.save(model_dir)
+
+    print(f"✅ Model successfully pushed to {commit_url}")
+    print(f"🔗 View your model at: {client.repo_url(repo_id)}")
 
 
 def main() -> None:
@@ -65,9 +271,27 @@ def main() -> None:
         type=str,
         help="Path to the directory containing the trained model files",
     )
+    parser.add_argument(
+        "--local_hub_dir",
+        type=str,
+        default=None,
+        help="Publish into this directory instead of HuggingFace Hub",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Upload all files even if unchanged since the last publish",
+    )
 
     args = parser.parse_args()
-    publish_model_to_hub(model_dir=Path(args.model_dir))
+    client: UploadClient = (
+        LocalUploadClient(Path(args.local_hub_dir))
+        if args.local_hub_dir
+        else HubUploadClient()
+    )
+    publish_model_to_hub(
+        model_dir=Path(args.model_dir), client=client, force=args.force
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+"""Run `lerobot-train` with camera frames served from a memory-mapped cache.
+
+Arguments are the same as `lerobot-train`. The cache is built on first use
+(or rebuilt when the dataset has changed) next to the dataset root, or at
+`FRAME_CACHE_DIR` if set.
+
+Usage:
+    python scripts/train_with_frame_cache.py \
+        --config_path configs/example_gym_hil_train.json
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import lerobot.scripts.lerobot_train as lst
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+
+from lerobot_trial.frame_cache import (
+    attach_frame_cache,
+    default_frame_cache_dir,
+    load_or_build_frame_cache,
+)
+
+
+def main() -> None:
+    make_dataset = lst.make_dataset
+
+    def make_dataset_with_frame_cache(cfg: Any) -> LeRobotDataset:
+        dataset = make_dataset(cfg)
+
+        cache_dir = Path(
+            os.environ.get("FRAME_CACHE_DIR") or default_frame_cache_dir(dataset.root)
+        )
+        cache = load_or_build_frame_cache(dataset, cache_dir)
+        return attach_frame_cache(dataset, cache)
+
+    lst.make_dataset = make_dataset_with_frame_cache
+    lst.main()
+
+
+if __name__ == "__main__":
+    main()
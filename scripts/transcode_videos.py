@@ -0,0 +1,244 @@
+"""Re-encode camera videos of a recorded dataset in place, e.g., to shrink them.
+
+Video files are transcoded one by one into a temporary file next to the original,
+which replaces it only after its frame count is verified. Finished files are
+recorded in `meta/transcode_progress.json` and tagged with the settings in their
+metadata, so an interrupted run can be resumed by executing the same command
+again without encoding any file twice.
+
+Downscaling with `--height` and `--width` changes the image shapes of the
+dataset, which then cannot be recorded into again nor used to train policies
+for evaluation in the environment, whose cameras keep their resolution.
+
+Usage:
+    python scripts/transcode_videos.py \
+        --repo_id example/gym_hil_trial \
+        --root outputs/record/gym_hil_trial \
+        --crf 35 --num_workers 4
+"""
+
+import json
+import logging
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import av
+from lerobot.configs import parser
+from lerobot.datasets.lerobot_dataset import LeRobotDatasetMetadata
+from lerobot.datasets.utils import write_info
+from lerobot.datasets.video_utils import get_video_info
+from lerobot.utils.utils import init_logging
+
+PROGRESS_FILE = "meta/transcode_progress.json"
+# Container metadata tagging transcoded files with their `TranscodeTarget`
+TAG_KEY = "comment"
+TAG_PREFIX = "lerobot-trial-transcode:"
+
+
+@dataclass
+class TranscodeVideosConfig:
+    repo_id: str
+    root: str
+    # Downscale frames to (height, width) if both are given.
+    height: int | None = None
+    width: int | None = None
+    vcodec: str = "libsvtav1"
+    pix_fmt: str = "yuv420p"
+    crf: int = 30
+    g: int = 2  # GOP size; small values keep random access during training fast.
+    num_workers: int = 4
+
+
+@dataclass
+class TranscodeTarget:
+    """Everything that determines the output, to refuse resuming with others."""
+
+    height: int | None
+    width: int | None
+    vcodec: str
+    pix_fmt: str
+    crf: int
+    g: int
+
+    @classmethod
+    def from_config(cls, cfg: TranscodeVideosConfig) -> "TranscodeTarget":
+        if (cfg.height is None) != (cfg.width is None):
+            raise ValueError("Give both `height` and `width` to downscale, or neither.")
+
+        return cls(
+            height=cfg.height,
+            width=cfg.width,
+            vcodec=cfg.vcodec,
+            pix_fmt=cfg.pix_fmt,
+            crf=cfg.crf,
+            g=cfg.g,
+        )
+
+    @property
+    def tag(self) -> str:
+        return TAG_PREFIX + json.dumps(asdict(self), sort_keys=True)
+
+
+def transcode_video(video_path: Path, target: TranscodeTarget, fps: int) -> int:
+    """Transcodes a single video file in place and returns its frame count.
+
+    A file already transcoded for `target` is left as it is, which happens if
+    the previous run was interrupted before recording its progress.
+    """
+
+    if _read_tag(video_path) == target.tag:
+        return _count_frames(video_path)
+
+    tmp_path = video_path.with_suffix(".tmp")
+    options = {"g": str(target.g), "crf": str(target.crf)}
+    if target.vcodec == "libsvtav1":
+        options["preset"] = "12"  # Same as LeRobot's encoding
+
+    num_frames = 0
+    with av.open(str(video_path)) as src, av.open(str(tmp_path), "w", "mp4") as dst:
+        src_stream = src.streams.video[0]
+        height = target.height or src_stream.height
+        width = target.width or src_stream.width
+
+        dst_stream = dst.add_stream(target.vcodec, fps, options=options)
+        if not isinstance(dst_stream, av.VideoStream):
+            raise ValueError(f"Not a video codec: {target.vcodec}")
+        dst_stream.pix_fmt = target.pix_fmt
+        dst_stream.height = height
+        dst_stream.width = width
+        dst.metadata[TAG_KEY] = target.tag
+
+        for frame in src.decode(src_stream):
+            # Area interpolation avoids aliasing when downscaling.
+            frame = frame.reformat(
+                width, height, format=target.pix_fmt, interpolation="AREA"
+            )
+            # Keep frames at `index / fps` for episode timestamps to stay valid.
+            frame.pts = num_frames
+            dst.mux(dst_stream.encode(frame))
+            num_frames += 1
+        dst.mux(dst_stream.encode())
+
+    if (num_encoded := _count_frames(tmp_path)) != num_frames:
+        tmp_path.unlink()
+        raise RuntimeError(
+            f"Frame count mismatch in {video_path}: {num_frames} -> {num_encoded}"
+        )
+
+    os.replace(tmp_path, video_path)
+    return num_frames
+
+
+def load_progress(root: Path, target: TranscodeTarget) -> dict[str, int]:
+    """Loads frame counts of already transcoded files, relative to `root`."""
+
+    progress_path = root / PROGRESS_FILE
+    if not progress_path.exists():
+        return {}
+
+    with open(progress_path) as f:
+        progress = json.load(f)
+
+    if progress["target"] != asdict(target):
+        raise RuntimeError(
+            f"Unfinished transcoding with different settings: {progress['target']}"
+        )
+
+    return dict(progress["done"])
+
+
+def save_progress(root: Path, target: TranscodeTarget, done: dict[str, int]) -> None:
+    progress_path = root / PROGRESS_FILE
+    tmp_path = progress_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"target": asdict(target), "done": done}, f, indent=2)
+    os.replace(tmp_path, progress_path)
+
+
+def update_video_features(
+    meta: LeRobotDatasetMetadata, root: Path, video_paths: dict[str, list[Path]]
+) -> None:
+    for key, paths in video_paths.items():
+        video_info = get_video_info(paths[0])
+        feature: dict[str, Any] = meta.info["features"][key]
+        feature["info"] = video_info
+
+        shape = {
+            "height": video_info["video.height"],
+            "width": video_info["video.width"],
+            "channels": video_info["video.channels"],
+        }
+        feature["shape"] = [shape[name] for name in feature["names"]]
+
+    write_info(meta.info, root)
+
+
+def _read_tag(video_path: Path) -> str | None:
+    with av.open(str(video_path)) as container:
+        tag: str | None = container.metadata.get(TAG_KEY)
+        return tag
+
+
+def _count_frames(video_path: Path) -> int:
+    with av.open(str(video_path)) as container:
+        return sum(1 for _ in container.decode(video=0))
+
+
+@parser.wrap()  # type: ignore[misc]
+def main(cfg: TranscodeVideosConfig) -> None:
+    init_logging()
+
+    root = Path(cfg.root)
+    meta = LeRobotDatasetMetadata(repo_id=cfg.repo_id, root=root)
+    target = TranscodeTarget.from_config(cfg)
+
+    # Episodes are concatenated into shared video files, which are thus the unit
+    # of work rather than episodes.
+    video_paths = {
+        key: sorted((root / "videos" / key).glob("chunk-*/file-*.mp4"))
+        for key in meta.video_keys
+    }
+    done = load_progress(root, target)
+    todo = [
+        p
+        for paths in video_paths.values()
+        for p in paths
+        if str(p.relative_to(root)) not in done
+    ]
+
+    logging.info(
+        f"Transcoding {len(todo)} video files ({len(done)} already done) "
+        f"with {cfg.num_workers} workers..."
+    )
+
+    # Decoding and encoding are CPU-bound, so each file gets its own process.
+    with ProcessPoolExecutor(
+        cfg.num_workers, mp_context=mp.get_context("spawn")
+    ) as pool:
+        futures = {pool.submit(transcode_video, p, target, meta.fps): p for p in todo}
+        for future in as_completed(futures):
+            path = futures[future]
+            done[str(path.relative_to(root))] = future.result()
+            save_progress(root, target, done)
+            logging.info(f"[{len(done)}] Transcoded {path.relative_to(root)}")
+
+    for key, paths in video_paths.items():
+        num_frames = sum(done[str(p.relative_to(root))] for p in paths)
+        if num_frames != meta.total_frames:
+            raise RuntimeError(
+                f"Frame count mismatch for {key}: {num_frames} != {meta.total_frames}"
+            )
+
+    update_video_features(meta, root, video_paths)
+    (root / PROGRESS_FILE).unlink()
+
+    for key in meta.video_keys:
+        print(f"{key}: {meta.info['features'][key]['shape']}")
+
+
+if __name__ == "__main__":
+    main()
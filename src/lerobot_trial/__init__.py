@@ -1,5 +1,19 @@
+from typing import TYPE_CHECKING, Any
+
 from .config import COMMON_CONFIG
-from .gym_client import DoraEventStreamClosed
 from .lerobot_control_events import lerobot_control_events
 
+if TYPE_CHECKING:
+    from .gym_client import DoraEventStreamClosed
+
 __all__ = ["COMMON_CONFIG", "DoraEventStreamClosed", "lerobot_control_events"]
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first access not to load Dora and LeRobot in every node.
+    if name == "DoraEventStreamClosed":
+        from .gym_client import DoraEventStreamClosed
+
+        return DoraEventStreamClosed
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
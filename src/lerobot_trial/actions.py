@@ -0,0 +1,41 @@
+"""Actions exchanged between nodes, independent of the simulator itself."""
+
+from enum import Enum
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Move of a commanded position per tick while a key is held down
+KEY_STEP_SIZE = 0.005
+
+
+class ActionDim(str, Enum):
+    X = "x"
+    Y = "y"
+    Z = "z"
+    GRIPPER = "gripper"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+def init_action() -> dict[ActionDim, float]:
+    return {
+        ActionDim.X: 0.0,
+        ActionDim.Y: 0.0,
+        ActionDim.Z: 0.0,
+        ActionDim.GRIPPER: 0.0,
+    }
+
+
+def make_action_array(action: dict[ActionDim, float]) -> NDArray[np.floating]:
+    env_action = [
+        action[ActionDim.X],
+        action[ActionDim.Y],
+        action[ActionDim.Z],
+        0.0,  # No orientation control
+        0.0,
+        0.0,
+        action[ActionDim.GRIPPER],
+    ]
+    return np.array(env_action)
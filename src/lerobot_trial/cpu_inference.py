@@ -0,0 +1,79 @@
+"""CPU-targeted optimizations of a trained policy for evaluation and deployment.
+
+Note that LeRobot already queries policies under `torch.inference_mode`.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+
+import torch
+from lerobot.policies.pretrained import PreTrainedPolicy
+from torch import nn
+
+
+@dataclass
+class CpuInferenceConfig:
+    # Dynamic int8 quantization of linear layers.
+    quantize: bool = False
+    # Compile the underlying model with `torch.compile`.
+    compile: bool = False
+    # Number of intra-op threads; PyTorch's default if not given.
+    num_threads: int | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.quantize or self.compile or self.num_threads is not None
+
+    @classmethod
+    def from_env(cls) -> "CpuInferenceConfig":
+        """Reads e.g. `CPU_INFERENCE=quantize,compile` and `CPU_INFERENCE_THREADS=4`."""
+
+        env_value = os.environ.get("CPU_INFERENCE", "")
+        options = {o.strip() for o in env_value.split(",") if o.strip()}
+        if unknown := options - {"quantize", "compile"}:
+            raise ValueError(f"Unknown CPU_INFERENCE options: {sorted(unknown)}")
+
+        threads = os.environ.get("CPU_INFERENCE_THREADS")
+        return cls(
+            quantize="quantize" in options,
+            compile="compile" in options,
+            num_threads=int(threads) if threads else None,
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"quantize={self.quantize}, compile={self.compile}, "
+            f"num_threads={self.num_threads}"
+        )
+
+
+def optimize_policy_for_cpu(
+    policy: PreTrainedPolicy, config: CpuInferenceConfig
+) -> PreTrainedPolicy:
+    """Applies `config` to a policy loaded on CPU, modifying it in place."""
+
+    if not config.enabled:
+        return policy
+
+    logging.info(f"Optimizing policy for CPU inference: {config}")
+
+    if config.num_threads is not None:
+        torch.set_num_threads(config.num_threads)
+
+    policy.eval()
+
+    if config.quantize:
+        torch.ao.quantization.quantize_dynamic(
+            policy, {nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+
+    if config.compile:
+        # Policies keep their network in `model` and pre/post-process around it.
+        model = getattr(policy, "model", None)
+        if isinstance(model, nn.Module):
+            policy.model = torch.compile(model)
+        else:
+            logging.warning(f"Cannot compile {type(policy).__name__}: no `model`.")
+
+    return policy
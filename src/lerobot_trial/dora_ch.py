@@ -13,6 +13,7 @@ class ChannelId(str, Enum):
     ACTION = "action"
     CONTROL = "control"
     EPISODE = "episode"
+    REWIND = "rewind"
 
     def __str__(self) -> str:
         return self.value
@@ -22,6 +23,7 @@ class ControlCmd(int, Enum):
     ESC = 1
     CTRL = 2
     SPACE = 3
+    BACKSPACE = 4
 
     @staticmethod
     def from_event(event: DoraEvent) -> "ControlCmd":
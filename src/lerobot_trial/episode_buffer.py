@@ -0,0 +1,50 @@
+"""Editing of LeRobot's in-memory episode buffer before it is saved."""
+
+from pathlib import Path
+
+import numpy as np
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from numpy.typing import NDArray
+
+
+def drop_buffered_frames(dataset: LeRobotDataset, keep: NDArray[np.bool_]) -> None:
+    """Drops frames from the current episode buffer of `dataset`.
+
+    Images already written for dropped frames are deleted, and the remaining
+    ones are renumbered to stay contiguous, as the video encoder expects.
+    """
+
+    buffer = dataset.episode_buffer
+    size: int = buffer["size"]
+
+    # Images are written asynchronously, so wait before touching them.
+    if dataset.image_writer is not None:
+        dataset.image_writer.wait_until_done()
+
+    kept_indices = np.flatnonzero(keep)
+    image_keys = [
+        key for key, ft in dataset.features.items() if ft["dtype"] in ["image", "video"]
+    ]
+
+    for key in image_keys:
+        paths = [Path(p) for p in buffer[key]]
+        for i in np.flatnonzero(~keep):
+            paths[i].unlink(missing_ok=True)
+
+        renamed = []
+        for new_index, old_index in enumerate(kept_indices):
+            old_path = paths[old_index]
+            new_path = old_path.with_name(f"frame-{new_index:06d}{old_path.suffix}")
+            if new_path != old_path:
+                old_path.rename(new_path)
+            renamed.append(str(new_path))
+        buffer[key] = renamed
+
+    for key, val in buffer.items():
+        if key not in image_keys and isinstance(val, list) and len(val) == size:
+            buffer[key] = [val[i] for i in kept_indices]
+
+    num_kept = len(kept_indices)
+    buffer["frame_index"] = list(range(num_kept))
+    buffer["timestamp"] = [i / dataset.fps for i in range(num_kept)]
+    buffer["size"] = num_kept
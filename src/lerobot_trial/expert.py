@@ -0,0 +1,119 @@
+"""Scripted expert to pick up a cube using privileged simulator state."""
+
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+from gym_hil import MujocoGymEnv
+from lerobot.processor import RobotAction, RobotObservation
+from numpy.typing import NDArray
+
+from .actions import KEY_STEP_SIZE, ActionDim
+from .gym_hil import AbsolutePositionControl
+
+# Sensors of the pick-cube environment locating the cube and the pinch point.
+BLOCK_SENSOR = "block_pos"
+PINCH_SENSOR = "2f85/pinch_pos"
+
+
+class Phase(int, Enum):
+    APPROACH = 0  # Move above the cube with the gripper open
+    DESCEND = 1
+    GRASP = 2  # Close the gripper and wait for the fingers to settle
+    LIFT = 3
+
+
+@dataclass
+class ExpertConfig:
+    # Maximum move of the commanded position per tick, like a key held down.
+    max_step: float = KEY_STEP_SIZE
+    hover_height: float = 0.1  # Above the cube, before descending
+    grasp_height: float = 0.0  # Of the pinch point relative to the cube center
+    lift_height: float = 0.2  # Above the cube position at grasping
+    tolerance: float = 0.01  # Distance to regard a waypoint as reached
+    grasp_ticks: int = 5
+    # Standard deviation of per-episode waypoint offsets to diversify demos.
+    jitter: float = 0.005
+
+
+class ScriptedPickController:
+    """Picks up the cube through the same absolute position commands as keyboard.
+
+    Commanded positions are accumulated from the origin at reset as the keyboard
+    node does, so recorded actions share the distribution of teleoperation.
+    """
+
+    def __init__(
+        self, env: AbsolutePositionControl, config: ExpertConfig | None = None
+    ) -> None:
+        self._env = env
+        self._config = config or ExpertConfig()
+        self.reset()
+
+    def reset(self) -> None:
+        self._phase = Phase.APPROACH
+        self._ticks_in_phase = 0
+        self._command = np.zeros(3)
+        self._gripper = 0.0
+        self._lift_from: NDArray[np.floating] | None = None
+        # NumPy's global RNG is seeded per episode by `run_episode`.
+        self._jitter = np.random.normal(0.0, self._config.jitter, size=3)
+
+    def __call__(self, observation: RobotObservation) -> RobotAction:
+        cfg = self._config
+        block, pinch = self._read_sensors()
+        self._ticks_in_phase += 1
+
+        match self._phase:
+            case Phase.APPROACH:
+                target = block + self._jitter + [0.0, 0.0, cfg.hover_height]
+                if self._move_towards(target, pinch):
+                    self._enter(Phase.DESCEND)
+            case Phase.DESCEND:
+                target = block + self._jitter * [1.0, 1.0, 0.0]
+                target[2] += cfg.grasp_height
+                if self._move_towards(target, pinch):
+                    self._enter(Phase.GRASP)
+            case Phase.GRASP:
+                self._gripper = 1.0
+                if self._ticks_in_phase >= cfg.grasp_ticks:
+                    self._lift_from = block.copy()
+                    self._enter(Phase.LIFT)
+            case Phase.LIFT:
+                assert self._lift_from is not None
+                target = self._lift_from + [0.0, 0.0, cfg.lift_height]
+                self._move_towards(target, pinch)
+
+        return {
+            ActionDim.X: float(self._command[0]),
+            ActionDim.Y: float(self._command[1]),
+            ActionDim.Z: float(self._command[2]),
+            ActionDim.GRIPPER: self._gripper,
+        }
+
+    def _enter(self, phase: Phase) -> None:
+        self._phase = phase
+        self._ticks_in_phase = 0
+
+    def _move_towards(
+        self, target: NDArray[np.floating], pinch: NDArray[np.floating]
+    ) -> bool:
+        """Steps the command to bring the pinch point to `target` if not there yet."""
+
+        error = target - pinch
+        if np.linalg.norm(error) < self._config.tolerance:
+            return True
+
+        # The pinch point is at a fixed offset from the commanded mocap body.
+        goal = self._env.get_position() + error
+        delta = goal - self._command
+        if (norm := np.linalg.norm(delta)) > self._config.max_step:
+            delta *= self._config.max_step / norm
+        self._command += delta
+        return False
+
+    def _read_sensors(self) -> tuple[NDArray[np.floating], NDArray[np.floating]]:
+        env: MujocoGymEnv = self._env.unwrapped
+        block = env.data.sensor(BLOCK_SENSOR).data.copy()
+        pinch = env.data.sensor(PINCH_SENSOR).data.copy()
+        return block, pinch
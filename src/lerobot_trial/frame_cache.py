@@ -0,0 +1,207 @@
+"""Memory-mapped cache of decoded video frames for training on recorded datasets.
+
+Decoding camera streams dominates data loading on CPU-only machines, and it is
+repeated every epoch. `FrameCache` decodes each camera stream once into a
+uint8 array of shape (total_frames, C, H, W) indexed by the dataset's global
+frame index, and `attach_frame_cache` makes a `LeRobotDataset` read from it.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.video_utils import decode_video_frames
+from numpy.typing import NDArray
+
+# Bump when the on-disk layout changes to invalidate existing caches.
+_CACHE_VERSION = 2
+_MANIFEST_FILE = "manifest.json"
+_EPISODE_INDEX_FILE = "episode_index.npy"
+
+
+class FrameCache:
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        with open(self.cache_dir / _MANIFEST_FILE) as f:
+            self.manifest: dict[str, Any] = json.load(f)
+
+        # (from_index, to_index) of each episode in the global frame index.
+        self._episode_index = np.load(self.cache_dir / _EPISODE_INDEX_FILE)
+        self._fps: int = self.manifest["fps"]
+        self._arrays: dict[str, NDArray[np.uint8]] | None = None
+
+    @property
+    def shapes(self) -> dict[str, tuple[int, int, int]]:
+        """Frame shapes as (C, H, W) for each camera key."""
+        return {k: (c, h, w) for k, (c, h, w) in self.manifest["shapes"].items()}
+
+    def is_valid_for(self, dataset: LeRobotDataset) -> bool:
+        return bool(self.manifest["fingerprint"] == dataset_fingerprint(dataset))
+
+    def query_videos(
+        self, query_timestamps: dict[str, list[float]], ep_idx: int
+    ) -> dict[str, torch.Tensor]:
+        """Drop-in replacement of `LeRobotDataset._query_videos`."""
+
+        from_index, to_index = self._episode_index[ep_idx]
+        item = {}
+        for key, query_ts in query_timestamps.items():
+            rows = np.clip(
+                from_index + np.round(np.asarray(query_ts) * self._fps).astype(int),
+                from_index,
+                to_index - 1,
+            )
+            frames = self._get_rows(key, rows)
+            item[key] = frames.float().div_(255.0).squeeze(0)
+
+        return item
+
+    def _get_rows(self, key: str, rows: NDArray[np.integer]) -> torch.Tensor:
+        array = self._open()[key]
+        if len(rows) > 0 and np.all(np.diff(rows) == 1):
+            # Contiguous rows are a view into the memory-mapped file.
+            return torch.from_numpy(array[rows[0] : rows[-1] + 1])
+        return torch.from_numpy(array[rows])
+
+    def _open(self) -> dict[str, NDArray[np.uint8]]:
+        # Opened lazily so that each DataLoader worker maps the files by itself.
+        if self._arrays is None:
+            self._arrays = {
+                key: np.load(self.cache_dir / _array_file(key), mmap_mode="c")
+                for key in self.manifest["shapes"]
+            }
+        return self._arrays
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Never pickle memory-mapped arrays, which would copy whole files.
+        return {**self.__dict__, "_arrays": None}
+
+
+def build_frame_cache(dataset: LeRobotDataset, cache_dir: Path) -> FrameCache:
+    """Decodes all camera streams of `dataset` into `cache_dir`.
+
+    Frames are cached at the recorded resolution, which evaluation feeds to
+    policies. The cache is written to a temporary directory first, so an
+    interrupted build never leaves a cache that looks valid.
+    """
+
+    meta = dataset.meta
+    cache_dir = Path(cache_dir)
+    tmp_dir = cache_dir.parent / (cache_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    episode_index = np.array(
+        [
+            (ep["dataset_from_index"], ep["dataset_to_index"])
+            for ep in (meta.episodes[i] for i in range(meta.total_episodes))
+        ],
+        dtype=np.int64,
+    )
+    np.save(tmp_dir / _EPISODE_INDEX_FILE, episode_index)
+
+    shapes = {}
+    for key in meta.video_keys:
+        height, width, channels = meta.features[key]["shape"]
+        shapes[key] = (channels, height, width)
+
+        array = np.lib.format.open_memmap(
+            tmp_dir / _array_file(key),
+            mode="w+",
+            dtype=np.uint8,
+            shape=(meta.total_frames, channels, height, width),
+        )
+        for ep, (from_index, to_index) in enumerate(episode_index):
+            logging.info(f"Decoding '{key}' of episode {ep}...")
+            frames = _decode_episode(dataset, key, ep, int(to_index - from_index))
+            array[from_index:to_index] = (
+                frames.mul(255.0).round_().to(torch.uint8).numpy()
+            )
+        array.flush()
+        del array
+
+    manifest = {
+        "version": _CACHE_VERSION,
+        "fps": meta.fps,
+        "shapes": shapes,
+        "fingerprint": dataset_fingerprint(dataset),
+    }
+    with open(tmp_dir / _MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    tmp_dir.rename(cache_dir)
+    return FrameCache(cache_dir)
+
+
+def load_or_build_frame_cache(dataset: LeRobotDataset, cache_dir: Path) -> FrameCache:
+    """Loads a frame cache, rebuilding it if the dataset has changed."""
+
+    if (Path(cache_dir) / _MANIFEST_FILE).exists():
+        cache = FrameCache(cache_dir)
+        if cache.is_valid_for(dataset):
+            return cache
+        logging.info(f"Frame cache at {cache_dir} is stale. Rebuilding...")
+
+    return build_frame_cache(dataset, cache_dir)
+
+
+def default_frame_cache_dir(dataset_root: Path | str) -> Path:
+    root = Path(dataset_root)
+    return root.parent / (root.name + "_frame_cache")
+
+
+def attach_frame_cache(dataset: LeRobotDataset, cache: FrameCache) -> LeRobotDataset:
+    """Makes `dataset` serve camera frames from `cache` instead of decoding videos."""
+
+    if not cache.is_valid_for(dataset):
+        raise ValueError(f"Frame cache at {cache.cache_dir} is stale.")
+
+    dataset._query_videos = cache.query_videos  # type: ignore[method-assign]
+    return dataset
+
+
+def dataset_fingerprint(dataset: LeRobotDataset) -> str:
+    """Hashes what the cache content depends on.
+
+    Metadata and video files are identified by their sizes and modification
+    times, which change whenever episodes are re-recorded or deleted.
+    """
+
+    root = Path(dataset.root)
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps([_CACHE_VERSION]).encode())
+
+    for path in sorted((root / "meta").rglob("*")) + sorted(
+        (root / "videos").rglob("*")
+    ):
+        if path.is_file():
+            stat = path.stat()
+            record = f"{path.relative_to(root)}:{stat.st_size}:{stat.st_mtime_ns}"
+            hasher.update(record.encode())
+
+    return hasher.hexdigest()
+
+
+def _decode_episode(
+    dataset: LeRobotDataset, key: str, ep_idx: int, length: int
+) -> torch.Tensor:
+    ep = dataset.meta.episodes[ep_idx]
+    from_timestamp = ep[f"videos/{key}/from_timestamp"]
+    timestamps = [from_timestamp + i / dataset.meta.fps for i in range(length)]
+
+    video_path = dataset.root / dataset.meta.get_video_file_path(ep_idx, key)
+    frames: torch.Tensor = decode_video_frames(
+        video_path, timestamps, dataset.tolerance_s, dataset.video_backend
+    )
+    return frames  # (T, C, H, W) in [0, 1]
+
+
+def _array_file(key: str) -> str:
+    return f"{key}.npy"
@@ -1,10 +1,13 @@
 import logging
 import time
+from collections import deque
+from dataclasses import dataclass
 from typing import Any
 
 from dora import Node
 from lerobot.utils.errors import DeviceNotConnectedError
 
+from .config import COMMON_CONFIG
 from .dora_ch import (
     ChannelId,
     ControlCmd,
@@ -12,16 +15,30 @@ from .dora_ch import (
     make_dict_message,
     try_recv_event,
 )
-from .gym_utils import step_io_from_event
+from .gym_utils import StepIO, step_io_from_event
 from .lerobot_control_events import ControlEventKey, lerobot_control_events
+from .startup import report_first_message
+from .step_queue import StepQueue, StreamStats
 
 logger = logging.getLogger(__name__)
 
+# Enough to cover an hour-long episode at 10 fps.
+FRAME_HISTORY_LENGTH = 36000
+
+# How long to wait for a new step before handing over the current one again.
+STEP_WAIT_TIMEOUT = 2 * COMMON_CONFIG.control_dt
+
 
 class DoraEventStreamClosed(Exception):
     pass
 
 
+@dataclass
+class FrameMeta:
+    seq: int  # `seq` of the episode message that carried the observation
+    done: bool
+
+
 class GymClient:
     """Single-thread client to interact with a Gym environment via Dora."""
 
@@ -34,13 +51,29 @@ class GymClient:
             cls._last_action: dict[str, float] | None = None  # action at t
             cls._last_observation: dict[str, Any] | None = None  # observation at t
             cls._updated_observation: dict[str, Any] | None = None  # observation at t+1
+            cls._last_meta = FrameMeta(seq=-1, done=False)  # metadata at t
+            cls._updated_meta = FrameMeta(seq=-1, done=False)  # metadata at t+1
+            # Metadata of each observation returned by `get_observation`
+            cls.frame_history: deque[FrameMeta] = deque(maxlen=FRAME_HISTORY_LENGTH)
+            # Observations with `seq` at or after this are to be discarded.
+            cls.pending_rewind: int | None = None
+            # Steps received but not handed over to `get_observation` yet
+            cls._steps = StepQueue.from_env()
         return cls._instance
 
+    @property
+    def stats(self) -> StreamStats:
+        return self._steps.stats
+
     def connect(self) -> None:
         while not self.is_connected():
             self._try_handle_event()
+            self._advance()
             time.sleep(0.1)  # Prevent busy waiting
 
+        # Do not let steps received while connecting delay the first frames.
+        self._steps.flush()
+
     def get_action(self) -> dict[str, float]:
         """Get the latest action."""
 
@@ -56,12 +89,25 @@ class GymClient:
         If `synchronized` is True, returns the observation corresponding
         to the latest action (i.e., observation at time t). Otherwise, returns
         the most recently updated observation (i.e., observation at time t+1).
+
+        While steps are handed over one by one for recording when synchronized,
+        a backlog is skipped otherwise so that a policy never acts on stale ones.
         """
 
         if not self.is_connected():
             raise DeviceNotConnectedError("GymClient is not connected.")
 
         self._try_handle_event()
+        if synchronized:
+            # A rewind is recorded with the next step, not as a frame of its own.
+            step = self._advance() or self._wait_for_step()
+            while step is not None and step.rewind_to is not None:
+                step = self._advance() or self._wait_for_step()
+        elif self._advance(latest=True) is None:
+            self._steps.stats.duplicates += 1
+        self.frame_history.append(
+            self._last_meta if synchronized else self._updated_meta
+        )
         return self._last_observation if synchronized else self._updated_observation  # type: ignore[return-value]
 
     def send_action(self, action: dict[str, float]) -> None:
@@ -85,10 +131,8 @@ class GymClient:
                     control = ControlCmd.from_event(event)
                     self._handle_control_event(control)
                 case ("INPUT", ChannelId.EPISODE):
-                    action, observation = step_io_from_event(event)
-                    self._last_action = action
-                    self._last_observation = self._updated_observation
-                    self._updated_observation = observation
+                    self._steps.put(step_io_from_event(event))
+                    report_first_message("lerobot")
                 case ("STOP", _):
                     logging.info("Received stop signal from Dora.")
                 case _:
@@ -96,6 +140,45 @@ class GymClient:
 
         raise DoraEventStreamClosed()
 
+    def _advance(self, latest: bool = False) -> StepIO | None:
+        """Hands over the next (or latest) queued step, if any, as the latest one."""
+
+        if (step := self._steps.get(latest=latest)) is not None:
+            self._handle_episode_event(step)
+        return step
+
+    def _wait_for_step(self) -> StepIO | None:
+        deadline = time.perf_counter() + STEP_WAIT_TIMEOUT
+        while time.perf_counter() < deadline:
+            time.sleep(0.005)  # Prevent busy waiting
+            self._try_handle_event()
+            if (step := self._advance()) is not None:
+                return step
+
+        # The same step is handed over again, i.e., recorded twice.
+        self._steps.stats.duplicates += 1
+        logger.debug(f"No new step within {STEP_WAIT_TIMEOUT} secs.")
+        return None
+
+    def _handle_episode_event(self, step: StepIO) -> None:
+        self._last_action = step.action
+
+        if step.rewind_to is None:
+            meta = FrameMeta(seq=step.seq, done=step.done)
+            self._last_observation = self._updated_observation
+            self._last_meta = self._updated_meta
+        else:
+            logger.info(f"Environment rewound to seq={step.rewind_to}.")
+            # The observation at the rewound time is sent again. It becomes the
+            # last observation with the next step, paired with the action applied.
+            meta = FrameMeta(seq=step.rewind_to, done=step.done)
+            self._last_observation = step.observation
+            self._last_meta = meta
+            self.pending_rewind = step.rewind_to
+
+        self._updated_observation = step.observation
+        self._updated_meta = meta
+
     def _handle_control_event(self, control: ControlCmd) -> None:
         match control:
             case ControlCmd.ESC:
@@ -106,6 +189,10 @@ class GymClient:
                 logger.info("Re-record the last episode...")
                 lerobot_control_events[ControlEventKey.EXIT_EARLY] = True
                 lerobot_control_events[ControlEventKey.RERECORD_EPISODE] = True
+                self._steps.flush()
             case ControlCmd.SPACE:
                 logger.info("Finish episode (or resetting phase)...")
                 lerobot_control_events[ControlEventKey.EXIT_EARLY] = True
+                self._steps.flush()
+            case ControlCmd.BACKSPACE:
+                logger.info("Rewind the current episode...")
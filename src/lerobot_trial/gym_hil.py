@@ -1,9 +1,10 @@
 """Utilities to interact with the Gym-HIL environment."""
 
-from enum import Enum
+from dataclasses import dataclass
 from typing import Any, SupportsFloat
 
 import gymnasium as gym
+import mujoco
 import numpy as np
 from gym_hil import GymRenderingSpec, MujocoGymEnv, PassiveViewerWrapper
 from numpy.typing import NDArray
@@ -11,14 +12,21 @@ from numpy.typing import NDArray
 from .config import COMMON_CONFIG
 
 
-class ActionDim(str, Enum):
-    X = "x"
-    Y = "y"
-    Z = "z"
-    GRIPPER = "gripper"
+@dataclass
+class SimState:
+    """Snapshot of a MuJoCo simulation and the episode bookkeeping around it."""
 
-    def __str__(self) -> str:
-        return self.value
+    time: float
+    qpos: NDArray[np.floating]
+    qvel: NDArray[np.floating]
+    act: NDArray[np.floating]
+    ctrl: NDArray[np.floating]
+    qacc_warmstart: NDArray[np.floating]
+    mocap_pos: NDArray[np.floating]
+    mocap_quat: NDArray[np.floating]
+    origin_xyz: NDArray[np.floating]
+    # Scalar attributes of the environment, e.g., block height to detect success
+    env_attrs: dict[str, Any]
 
 
 class AbsolutePositionControl(gym.Wrapper):  # type: ignore[type-arg]
@@ -45,21 +53,55 @@ class AbsolutePositionControl(gym.Wrapper):  # type: ignore[type-arg]
         action[6] = pseudo_grasp
         return self.env.step(action)
 
-    def _get_xyz(self) -> NDArray[np.floating]:
+    def capture_state(self) -> SimState:
         env: MujocoGymEnv = self.unwrapped
-        return env.data.mocap_pos[0].copy()  # type: ignore[no-any-return]
+        data = env.data
+        return SimState(
+            time=float(data.time),
+            qpos=data.qpos.copy(),
+            qvel=data.qvel.copy(),
+            act=data.act.copy(),
+            ctrl=data.ctrl.copy(),
+            qacc_warmstart=data.qacc_warmstart.copy(),
+            mocap_pos=data.mocap_pos.copy(),
+            mocap_quat=data.mocap_quat.copy(),
+            origin_xyz=self._origin_xyz.copy(),
+            env_attrs={
+                k: v
+                for k, v in vars(env).items()
+                if isinstance(v, (bool, int, float, np.number))
+            },
+        )
+
+    def restore_state(self, state: SimState) -> None:
+        """Restores a state captured in this or another env of the same model."""
 
+        env: MujocoGymEnv = self.unwrapped
+        data = env.data
+        data.time = state.time
+        data.qpos[:] = state.qpos
+        data.qvel[:] = state.qvel
+        data.act[:] = state.act
+        data.ctrl[:] = state.ctrl
+        data.qacc_warmstart[:] = state.qacc_warmstart
+        data.mocap_pos[:] = state.mocap_pos
+        data.mocap_quat[:] = state.mocap_quat
+        mujoco.mj_forward(env.model, data)
+
+        for k, v in state.env_attrs.items():
+            setattr(env, k, v)
+        self._origin_xyz = state.origin_xyz.copy()
+
+    def get_position(self) -> NDArray[np.floating]:
+        """Current position in the same coordinates as absolute position commands."""
+        return self._get_xyz() - self._origin_xyz
 
-def init_action() -> dict[ActionDim, float]:
-    return {
-        ActionDim.X: 0.0,
-        ActionDim.Y: 0.0,
-        ActionDim.Z: 0.0,
-        ActionDim.GRIPPER: 0.0,
-    }
+    def _get_xyz(self) -> NDArray[np.floating]:
+        env: MujocoGymEnv = self.unwrapped
+        return env.data.mocap_pos[0].copy()  # type: ignore[no-any-return]
 
 
-def make_env(headless: bool) -> MujocoGymEnv:
+def make_env(headless: bool) -> AbsolutePositionControl:
     env = gym.make(
         id="gym_hil/PandaPickCubeBase-v0",
         # Unlimited steps; episode will be done on success or user interrupt.
@@ -77,16 +119,3 @@ def make_env(headless: bool) -> MujocoGymEnv:
 
     env = env if headless else PassiveViewerWrapper(env)
     return AbsolutePositionControl(env)
-
-
-def make_action_array(action: dict[ActionDim, float]) -> NDArray[np.floating]:
-    env_action = [
-        action[ActionDim.X],
-        action[ActionDim.Y],
-        action[ActionDim.Z],
-        0.0,  # No orientation control
-        0.0,
-        0.0,
-        action[ActionDim.GRIPPER],
-    ]
-    return np.array(env_action)
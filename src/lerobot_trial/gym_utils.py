@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
@@ -6,14 +7,37 @@ import pyarrow as pa
 from .dora_ch import DoraEvent, make_dict_message, parse_single_value_in_event
 
 
+@dataclass
+class StepIO:
+    """Step input/output pair (action/observation) with its metadata.
+
+    Action at time t and observation at time t+1 are held together,
+    i.e., the observation is the result of applying the action.
+    """
+
+    action: dict[str, float]
+    observation: dict[str, Any]
+    # Monotonically increasing index of the message in the stream
+    seq: int = 0
+    # Whether the task had been completed at time t+1
+    done: bool = False
+    # If set, the environment was rewound to the observation of this `seq`,
+    # which is sent again as `observation` along with the action at that time.
+    rewind_to: int | None = None
+
+
 def step_io_to_message[T: str](
     action: dict[T, float],
     observation: dict[str, Any],
+    seq: int = 0,
+    done: bool = False,
+    rewind_to: int | None = None,
 ) -> pa.Array:
     """Converts a step input/output pair (action/observation) to a Dora message.
 
     Action at time t and observation at time t+1 should be provided together,
     i.e., the observation should be the result of applying the action.
+    See `StepIO` for the other arguments.
     """
     flattened = {
         key: {
@@ -25,18 +49,18 @@ def step_io_to_message[T: str](
         for key, val in observation.items()
     }
 
-    message = {"action": action, "observation": flattened}
+    message = {
+        "action": action,
+        "observation": flattened,
+        "seq": seq,
+        "done": done,
+        "rewind_to": rewind_to,
+    }
     return make_dict_message(message)
 
 
-def step_io_from_event(
-    event: DoraEvent,
-) -> tuple[dict[str, float], dict[str, Any]]:
-    """Extracts a step input/output pair (action/observation) from a Dora event.
-
-    Action at time t and observation at time t+1 are returned together,
-    i.e., the observation is the result of applying the action.
-    """
+def step_io_from_event(event: DoraEvent) -> StepIO:
+    """Extracts a step input/output pair (action/observation) from a Dora event."""
     record = parse_single_value_in_event(event)
     observation = {
         key: {
@@ -48,4 +72,10 @@ def step_io_from_event(
         for key, val in record["observation"].items()
     }
 
-    return record["action"], observation
+    return StepIO(
+        action=record["action"],
+        observation=observation,
+        seq=record["seq"],
+        done=record["done"],
+        rewind_to=record["rewind_to"],
+    )
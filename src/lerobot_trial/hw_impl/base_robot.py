@@ -1,8 +1,6 @@
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING
 
-import gymnasium as gym
-import numpy as np
 from lerobot.processor import (
     RobotAction,
     RobotObservation,
@@ -10,7 +8,16 @@ from lerobot.processor import (
 from lerobot.robots import Robot, RobotConfig
 
 from ..gym_client import GymClient
-from .common import PolicyFeature
+from .common import (
+    ObservationStacker,
+    PolicyFeature,
+    is_visual_feature,
+    make_observation_features,
+    make_observations,
+)
+
+if TYPE_CHECKING:
+    import gymnasium as gym
 
 
 class ActionMode(int, Enum):
@@ -19,27 +26,38 @@ class ActionMode(int, Enum):
 
 
 class BaseRobot(Robot):  # type: ignore[misc]
+    # Whether policies take `StackedObservation`s; see `install_policy_fast_path`.
+    stack_observations = False
+
     def __init__(
         self,
         config: RobotConfig,
-        env: gym.Env,  # type: ignore[type-arg]
+        env: "gym.Env",  # type: ignore[type-arg]
         action_mode: ActionMode,
     ) -> None:
+        import gymnasium as gym
+
         super().__init__(config)
         self._client = GymClient()
 
         if not isinstance(env.observation_space, gym.spaces.Dict):
             raise ValueError("Observation space is not a dictionary")
 
-        self._observation_features = _make_observation_features(env.observation_space)
+        self._observation_features = make_observation_features(env.observation_space)
 
         self.cameras = {
             k: None  # Camera only exists virtually.
             for k, v in self._observation_features.items()
-            if _is_visual_feature(v)
+            if is_visual_feature(v)
         }
 
         self._action_mode = action_mode
+        # For policies, hand over state as a vector rather than scalars to restack.
+        self._stacker = (
+            ObservationStacker(env.observation_space)
+            if action_mode == ActionMode.POLICY and self.stack_observations
+            else None
+        )
 
     @property
     def observation_features(self) -> dict[str, PolicyFeature]:
@@ -52,7 +70,9 @@ class BaseRobot(Robot):  # type: ignore[misc]
     def get_observation(self) -> RobotObservation:
         synchronized = self._action_mode == ActionMode.TELEOP
         env_observation = self._client.get_observation(synchronized=synchronized)
-        return _make_observations(env_observation)
+        if self._stacker is not None:
+            return self._stacker.stack(env_observation)
+        return make_observations(env_observation)
 
     def send_action(self, action: RobotAction) -> RobotAction:
         if self._action_mode == ActionMode.POLICY:
@@ -78,41 +98,3 @@ class BaseRobot(Robot):  # type: ignore[misc]
 
     def configure(self) -> None:
         pass
-
-
-def _make_observations(original: dict[str, Any]) -> RobotObservation:
-    observations = {}
-    for key, val in original.items():
-        if isinstance(val, dict):
-            # Will flatten nested pixel (image) observations
-            observations.update(_make_observations(val))
-        elif isinstance(val, np.ndarray) and val.ndim == 1:
-            # Will flatten a state vector as indexed scalars
-            observations.update({f"{key}.{i:02d}": v for i, v in enumerate(val)})
-        elif isinstance(val, np.ndarray) and val.ndim == 3:
-            observations[key] = val  # Keep an image as is
-        else:
-            raise ValueError(f"Unsupported observation at '{key}': {val}")
-
-    return observations
-
-
-def _make_observation_features(
-    root_space: gym.spaces.Dict,
-) -> dict[str, PolicyFeature]:
-    features = {}
-    for key, space in root_space.spaces.items():
-        if isinstance(space, gym.spaces.Dict):
-            features.update(_make_observation_features(space))
-        elif isinstance(space, gym.spaces.Box) and len(space.shape) == 1:
-            features.update({f"{key}.{i:02d}": float for i in range(space.shape[0])})
-        elif isinstance(space, gym.spaces.Box) and len(space.shape) == 3:
-            features[key] = space.shape
-        else:
-            raise ValueError(f"Unsupported observation space at '{key}': {space}")
-
-    return features
-
-
-def _is_visual_feature(ft: PolicyFeature) -> bool:
-    return isinstance(ft, tuple) and len(ft) == 3
@@ -1,2 +1,128 @@
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from lerobot.processor import RobotObservation
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    # Gymnasium is imported only when spaces are actually inspected.
+    import gymnasium as gym
+
 # FIXME: Use `lerobot.configs.types.PolicyFeature`.
 type PolicyFeature = type | tuple[int, ...]
+
+
+def make_observations(original: dict[str, Any]) -> RobotObservation:
+    """Flattens a Gym observation into LeRobot's robot observation format."""
+
+    observations = {}
+    for key, val in original.items():
+        if isinstance(val, dict):
+            # Will flatten nested pixel (image) observations
+            observations.update(make_observations(val))
+        elif isinstance(val, np.ndarray) and val.ndim == 1:
+            # Will flatten a state vector as indexed scalars
+            observations.update({f"{key}.{i:02d}": v for i, v in enumerate(val)})
+        elif isinstance(val, np.ndarray) and val.ndim == 3:
+            observations[key] = val  # Keep an image as is
+        else:
+            raise ValueError(f"Unsupported observation at '{key}': {val}")
+
+    return observations
+
+
+def make_observation_features(
+    root_space: "gym.spaces.Dict",
+) -> dict[str, PolicyFeature]:
+    """Makes LeRobot's observation features from a Gym observation space."""
+
+    import gymnasium as gym
+
+    features = {}
+    for key, space in root_space.spaces.items():
+        if isinstance(space, gym.spaces.Dict):
+            features.update(make_observation_features(space))
+        elif isinstance(space, gym.spaces.Box) and len(space.shape) == 1:
+            features.update({f"{key}.{i:02d}": float for i in range(space.shape[0])})
+        elif isinstance(space, gym.spaces.Box) and len(space.shape) == 3:
+            features[key] = space.shape
+        else:
+            raise ValueError(f"Unsupported observation space at '{key}': {space}")
+
+    return features
+
+
+def is_visual_feature(ft: PolicyFeature) -> bool:
+    return isinstance(ft, tuple) and len(ft) == 3
+
+
+class StackedObservation(dict[str, Any]):
+    """Robot observation whose state values are also stacked into a single vector.
+
+    It holds the same flat keys as the observation made by `make_observations`,
+    so it passes through LeRobot's processors as is, while the state vector and
+    images can also be taken as they are from `state` and `images`.
+    """
+
+    def __init__(
+        self,
+        state: NDArray[np.float32],
+        state_names: list[str],
+        images: dict[str, NDArray[np.uint8]],
+    ) -> None:
+        super().__init__(zip(state_names, state))
+        self.update(images)
+        self.state = state
+        self.state_names = state_names
+        self.images = images
+
+
+class ObservationStacker:
+    """Makes `StackedObservation`s with a layout resolved once from the space."""
+
+    def __init__(self, root_space: "gym.spaces.Dict") -> None:
+        # Path to each state vector in a Gym observation and where it goes
+        self._state_layout: list[tuple[tuple[str, ...], slice]] = []
+        self._image_paths: dict[str, tuple[str, ...]] = {}
+        self._state_size = 0
+        self._resolve_layout(root_space, ())
+
+        features = make_observation_features(root_space)
+        state_names = [k for k, ft in features.items() if not is_visual_feature(ft)]
+        self._state_names = state_names
+
+    def stack(self, original: dict[str, Any]) -> StackedObservation:
+        # A new vector every step, as recorded frames keep a reference to it.
+        state = np.empty(self._state_size, dtype=np.float32)
+        for path, dst in self._state_layout:
+            state[dst] = _get_path(original, path)
+
+        images = {
+            key: _get_path(original, path) for key, path in self._image_paths.items()
+        }
+        return StackedObservation(state, self._state_names, images)
+
+    def _resolve_layout(
+        self, space: "gym.spaces.Dict", prefix: tuple[str, ...]
+    ) -> None:
+        import gymnasium as gym
+
+        # Same traversal as `make_observation_features`, which names the values.
+        for key, sub_space in space.spaces.items():
+            path = (*prefix, key)
+            if isinstance(sub_space, gym.spaces.Dict):
+                self._resolve_layout(sub_space, path)
+            elif len(sub_space.shape) == 1:
+                size = sub_space.shape[0]
+                dst = slice(self._state_size, self._state_size + size)
+                self._state_layout.append((path, dst))
+                self._state_size += size
+            else:
+                self._image_paths[key] = path
+
+
+def _get_path(original: dict[str, Any], path: tuple[str, ...]) -> Any:
+    value: Any = original
+    for key in path:
+        value = value[key]
+    return value
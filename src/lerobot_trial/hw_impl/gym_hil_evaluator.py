@@ -2,7 +2,7 @@ from dataclasses import dataclass
 
 from lerobot.robots import RobotConfig
 
-from ..gym_hil import ActionDim, make_env
+from ..actions import ActionDim
 from .base_robot import ActionMode, BaseRobot
 from .common import PolicyFeature
 
@@ -18,6 +18,9 @@ class GymHILEvaluatorRobot(BaseRobot):
     name = "gym_hil_evaluator"
 
     def __init__(self, config: GymHILEvaluatorRobotConfig) -> None:
+        # Import MuJoCo only when the robot is actually instantiated.
+        from ..gym_hil import make_env
+
         env = make_env(headless=True)
         super().__init__(config, env=env, action_mode=ActionMode.POLICY)
         env.close()
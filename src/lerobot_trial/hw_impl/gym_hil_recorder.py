@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from lerobot.robots import RobotConfig
 from lerobot.teleoperators import TeleoperatorConfig
 
-from ..gym_hil import ActionDim, make_env
+from ..actions import ActionDim
 from .base_robot import ActionMode, BaseRobot
 from .base_teleop import BaseTeleop
 from .common import PolicyFeature
@@ -20,6 +20,9 @@ class GymHILRecorderRobot(BaseRobot):
     name = "gym_hil_recorder"
 
     def __init__(self, config: GymHILRecorderRobotConfig) -> None:
+        # Import MuJoCo only when the robot is actually instantiated.
+        from ..gym_hil import make_env
+
         env = make_env(headless=True)
         super().__init__(config, env=env, action_mode=ActionMode.TELEOP)
         env.close()
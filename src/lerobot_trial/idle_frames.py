@@ -0,0 +1,184 @@
+"""Trimming of idle/frozen frames from recorded episodes.
+
+Episodes often start with the operator idling, and the last frame is recorded
+repeatedly between task completion and the operator finishing the episode.
+Such near-duplicate frames are dropped from the episode buffer right before
+`LeRobotDataset.save_episode`, so they never reach disk.
+"""
+
+import logging
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from numpy.typing import NDArray
+
+from .episode_buffer import drop_buffered_frames
+
+STATE_KEY = "observation.state"
+ACTION_KEY = "action"
+# Done flag of each buffered frame, kept in the episode buffer along with the
+# frames so that it stays aligned when frames are dropped, e.g., by rewinding.
+DONE_KEY = "_done"
+
+
+@dataclass
+class IdleTrimConfig:
+    # Absolute tolerance to regard action and state as unchanged.
+    atol: float = 1e-4
+    # Idle stretches at both ends shorter than this are kept as they are.
+    min_idle_frames: int = 5
+    # Number of frames kept from the first frame where the task is done.
+    keep_after_done: int = 1
+
+    @classmethod
+    def from_env(cls) -> "IdleTrimConfig | None":
+        """Reads `TRIM_IDLE_*` environment variables; `None` if disabled."""
+
+        if os.environ.get("TRIM_IDLE_FRAMES", "1") == "0":
+            return None
+
+        config = cls()
+        if atol := os.environ.get("TRIM_IDLE_ATOL"):
+            config.atol = float(atol)
+        if min_idle_frames := os.environ.get("TRIM_IDLE_MIN_FRAMES"):
+            config.min_idle_frames = int(min_idle_frames)
+        if keep_after_done := os.environ.get("TRIM_IDLE_KEEP_AFTER_DONE"):
+            config.keep_after_done = int(keep_after_done)
+        return config
+
+
+@dataclass
+class TrimReport:
+    num_frames: int
+    leading: int = 0
+    after_done: int = 0
+    trailing: int = 0
+
+    @property
+    def num_dropped(self) -> int:
+        return self.leading + self.after_done + self.trailing
+
+    def __str__(self) -> str:
+        return (
+            f"dropped {self.num_dropped}/{self.num_frames} frames "
+            f"(leading={self.leading}, after_done={self.after_done}, "
+            f"trailing={self.trailing})"
+        )
+
+
+def find_frames_to_keep(
+    actions: NDArray[np.floating],
+    states: NDArray[np.floating],
+    done: Sequence[bool],
+    config: IdleTrimConfig,
+) -> tuple[NDArray[np.bool_], TrimReport]:
+    """Finds frames to keep in an episode of `len(actions)` frames.
+
+    A frame is idle if both its action and state are unchanged from the
+    previous frame. Idle stretches are trimmed only at both ends of the
+    episode, keeping the first (or last, at the start) frame of each. If the
+    task is done, frames after it are dropped except `keep_after_done` instead.
+    """
+
+    num_frames = len(actions)
+    if len(done) != num_frames:
+        raise ValueError(f"Got {len(done)} done flags for {num_frames} frames.")
+
+    keep = np.ones(num_frames, dtype=bool)
+    report = TrimReport(num_frames=num_frames)
+    if num_frames == 0:
+        return keep, report
+
+    # unchanged[i] tells whether frame i + 1 is the same as frame i.
+    unchanged = _unchanged(actions, config.atol) & _unchanged(states, config.atol)
+
+    # Drop idle frames at the start, but keep the one just before moving.
+    num_leading = _count_true_prefix(unchanged)
+    if num_leading + 1 >= config.min_idle_frames:
+        keep[:num_leading] = False
+        report.leading = num_leading
+
+    if done_indices := [i for i, d in enumerate(done) if d]:
+        # Task completion is a stronger signal than unchanged frames.
+        end = min(num_frames, done_indices[0] + max(1, config.keep_after_done))
+        report.after_done = int(keep[end:].sum())
+        keep[end:] = False
+        return keep, report
+
+    # Drop frames frozen at the end, but keep the first one of them.
+    num_trailing = min(_count_true_prefix(unchanged[::-1]), int(keep.sum()) - 1)
+    if num_trailing + 1 >= config.min_idle_frames:
+        keep[num_frames - num_trailing :] = False
+        report.trailing = num_trailing
+
+    return keep, report
+
+
+def trim_episode_buffer(
+    dataset: LeRobotDataset, done: Sequence[bool], config: IdleTrimConfig
+) -> TrimReport:
+    """Drops idle frames from the current episode buffer of `dataset`.
+
+    `done` tells whether the task had been done at each buffered frame.
+    """
+
+    buffer = dataset.episode_buffer
+    keep, report = find_frames_to_keep(
+        np.stack(buffer[ACTION_KEY]), np.stack(buffer[STATE_KEY]), done, config
+    )
+    if report.num_dropped == 0:
+        return report
+
+    drop_buffered_frames(dataset, keep)
+    return report
+
+
+def install_idle_frame_trimming(
+    get_done: Callable[[], bool], config: IdleTrimConfig
+) -> None:
+    """Makes `LeRobotDataset.save_episode` trim idle frames beforehand.
+
+    `get_done` tells whether the task had been done at the frame being added.
+    It is called for each frame, as frames observed after recording, e.g., in
+    a resetting phase, cannot be told apart later.
+    """
+
+    add_frame = LeRobotDataset.add_frame
+
+    def add_frame_with_done(
+        self: LeRobotDataset, frame: dict[str, Any], *args: Any, **kwargs: Any
+    ) -> None:
+        add_frame(self, frame, *args, **kwargs)
+        self.episode_buffer.setdefault(DONE_KEY, []).append(get_done())
+
+    save_episode = LeRobotDataset.save_episode
+
+    def save_trimmed_episode(
+        self: LeRobotDataset, episode_data: dict[str, Any] | None = None
+    ) -> None:
+        buffer = self.episode_buffer
+        # LeRobot does not know the flags, which must not be saved.
+        done = buffer.pop(DONE_KEY, []) if buffer is not None else []
+        if episode_data is None and buffer is not None and buffer["size"] > 0:
+            if len(done) == buffer["size"]:
+                report = trim_episode_buffer(self, done, config)
+                logging.info(f"Episode {buffer['episode_index']}: {report}")
+            else:
+                logging.warning("Done flags are not aligned with frames to trim.")
+        save_episode(self, episode_data)
+
+    LeRobotDataset.add_frame = add_frame_with_done  # type: ignore[method-assign]
+    LeRobotDataset.save_episode = save_trimmed_episode  # type: ignore[method-assign]
+
+
+def _unchanged(values: NDArray[np.floating], atol: float) -> NDArray[np.bool_]:
+    close = np.isclose(values[1:], values[:-1], rtol=0.0, atol=atol)
+    return np.all(close.reshape(len(close), -1), axis=1)
+
+
+def _count_true_prefix(flags: NDArray[np.bool_]) -> int:
+    return int(np.argmin(flags)) if not np.all(flags) else len(flags)
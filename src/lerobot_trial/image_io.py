@@ -0,0 +1,216 @@
+"""Sizing and monitoring of LeRobot's asynchronous image writer while recording.
+
+Camera frames are queued in memory until the image writer encodes them into
+files, which are turned into videos at the end of each episode. If writing
+falls behind, the queue grows silently until memory runs out, so its depth and
+write latency are watched here, and recording is held back if needed.
+"""
+
+import logging
+import math
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import lerobot.datasets.image_writer as image_writer
+import lerobot.scripts.lerobot_record as lsr
+import numpy as np
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.robots import Robot
+from lerobot.scripts.lerobot_record import DatasetRecordConfig
+
+logger = logging.getLogger(__name__)
+
+# Rough throughput of PNG encoding per thread with LeRobot's compression level.
+PIXELS_PER_SEC_PER_THREAD = 20e6
+# Threads beyond this per process mostly contend for the GIL.
+MAX_THREADS_PER_PROCESS = 8
+# Cores left for the record loop itself and the simulator.
+RESERVED_CPUS = 2
+
+
+@dataclass
+class ImageWriterSizing:
+    num_processes: int
+    num_threads_per_camera: int
+
+
+def size_image_writer(
+    image_shapes: list[tuple[int, ...]], fps: int, num_cpus: int
+) -> ImageWriterSizing:
+    """Sizes the image writer to keep up with all cameras, with 2x headroom."""
+
+    num_cameras = max(1, len(image_shapes))
+    pixels_per_sec = sum(math.prod(shape) for shape in image_shapes) * fps
+    needed = max(1, math.ceil(2 * pixels_per_sec / PIXELS_PER_SEC_PER_THREAD))
+    available = max(1, num_cpus - RESERVED_CPUS)
+    num_threads = min(needed, available)
+
+    if num_threads <= MAX_THREADS_PER_PROCESS:
+        return ImageWriterSizing(
+            num_processes=0,
+            num_threads_per_camera=math.ceil(num_threads / num_cameras),
+        )
+
+    # LeRobot runs the given number of threads in each of the processes.
+    num_processes = math.ceil(num_threads / MAX_THREADS_PER_PROCESS)
+    return ImageWriterSizing(
+        num_processes=num_processes,
+        num_threads_per_camera=math.ceil(num_threads / num_processes / num_cameras),
+    )
+
+
+def install_adaptive_image_writer(dataset_cfg: DatasetRecordConfig) -> None:
+    """Sizes the image writer from the robot's cameras once it is instantiated.
+
+    LeRobot's `record` reads `dataset_cfg` right after making the robot to
+    create the dataset.
+    """
+
+    make_robot_from_config = lsr.make_robot_from_config
+
+    def make_robot_and_size_image_writer(*args: Any, **kwargs: Any) -> Robot:
+        robot = make_robot_from_config(*args, **kwargs)
+        image_shapes = [robot.observation_features[k] for k in robot.cameras]
+        sizing = size_image_writer(image_shapes, dataset_cfg.fps, os.cpu_count() or 1)
+        logger.info(f"Image writer for {len(image_shapes)} cameras: {sizing}")
+
+        dataset_cfg.num_image_writer_processes = sizing.num_processes
+        dataset_cfg.num_image_writer_threads_per_camera = sizing.num_threads_per_camera
+        return robot
+
+    lsr.make_robot_from_config = make_robot_and_size_image_writer
+
+
+@dataclass
+class EpisodeIOStats:
+    num_images: int = 0
+    write_secs: list[float] = field(default_factory=list)  # Only for threads
+    max_queue_depth: int = 0
+    blocked_secs: float = 0.0  # Record loop held back by backpressure
+
+    def __str__(self) -> str:
+        summary = (
+            f"images={self.num_images}, max_queue_depth={self.max_queue_depth}, "
+            f"blocked={self.blocked_secs:.2f} secs"
+        )
+        if self.write_secs:
+            ms = np.array(self.write_secs) * 1e3
+            summary += (
+                f", write_ms_mean={ms.mean():.1f}, "
+                f"write_ms_p95={np.percentile(ms, 95):.1f}, write_ms_max={ms.max():.1f}"
+            )
+        return summary
+
+
+@dataclass
+class IOMonitorConfig:
+    # Queued images beyond this size hold back recording until half of it.
+    max_queue_mb: float = 1024.0
+
+    @classmethod
+    def from_env(cls) -> "IOMonitorConfig | None":
+        """Reads `IMAGE_WRITER_*` environment variables; `None` if disabled."""
+
+        if os.environ.get("IMAGE_WRITER_MONITOR", "1") == "0":
+            return None
+
+        config = cls()
+        if max_queue_mb := os.environ.get("IMAGE_WRITER_MAX_QUEUE_MB"):
+            config.max_queue_mb = float(max_queue_mb)
+        return config
+
+
+class IOMonitor:
+    def __init__(self, config: IOMonitorConfig) -> None:
+        self._config = config
+        self.stats = EpisodeIOStats()
+        self._warned = False
+
+    def record_write(self, secs: float) -> None:
+        self.stats.write_secs.append(secs)
+
+    def after_add_frame(self, dataset: LeRobotDataset) -> None:
+        if dataset.image_writer is None or not dataset.meta.camera_keys:
+            return
+
+        self.stats.num_images += len(dataset.meta.camera_keys)
+        if (depth := _queue_depth(dataset)) is None:
+            return
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, depth)
+
+        max_depth = self._max_queue_depth(dataset)
+        if depth > max_depth // 2 and not self._warned:
+            logger.warning(f"Image writer falls behind: {depth} images queued.")
+            self._warned = True
+        if depth > max_depth:
+            self._wait_for_queue(dataset, max_depth // 2)
+
+    def end_episode(self, index: int, save_secs: float) -> None:
+        logger.info(f"Episode {index} I/O: {self.stats}, save={save_secs:.2f} secs")
+        self.stats = EpisodeIOStats()
+        self._warned = False
+
+    def _max_queue_depth(self, dataset: LeRobotDataset) -> int:
+        image_bytes = np.mean(
+            [math.prod(dataset.features[k]["shape"]) for k in dataset.meta.camera_keys]
+        )
+        return max(2, int(self._config.max_queue_mb * 2**20 / image_bytes))
+
+    def _wait_for_queue(self, dataset: LeRobotDataset, target_depth: int) -> None:
+        logger.warning("Holding back recording until the image writer catches up...")
+        start = time.perf_counter()
+        while (depth := _queue_depth(dataset)) is not None and depth > target_depth:
+            time.sleep(0.01)
+        self.stats.blocked_secs += time.perf_counter() - start
+
+
+def install_io_monitoring(config: IOMonitorConfig) -> None:
+    """Makes `LeRobotDataset` report image writer I/O per episode."""
+
+    monitor = IOMonitor(config)
+
+    # Only writes in threads of this process can be timed this way.
+    image_writer.write_image = _timed(image_writer.write_image, monitor.record_write)
+
+    add_frame = LeRobotDataset.add_frame
+
+    def add_frame_and_monitor(
+        self: LeRobotDataset, frame: dict[str, Any], *args: Any, **kwargs: Any
+    ) -> None:
+        add_frame(self, frame, *args, **kwargs)
+        monitor.after_add_frame(self)
+
+    save_episode = LeRobotDataset.save_episode
+
+    def save_and_log_io(
+        self: LeRobotDataset, episode_data: dict[str, Any] | None = None
+    ) -> None:
+        buffer = self.episode_buffer
+        index = buffer["episode_index"] if buffer is not None else -1
+        start = time.perf_counter()
+        save_episode(self, episode_data)
+        monitor.end_episode(index, time.perf_counter() - start)
+
+    LeRobotDataset.add_frame = add_frame_and_monitor  # type: ignore[method-assign]
+    LeRobotDataset.save_episode = save_and_log_io  # type: ignore[method-assign]
+
+
+def _queue_depth(dataset: LeRobotDataset) -> int | None:
+    try:
+        return int(dataset.image_writer.queue.qsize())
+    except NotImplementedError:  # Multiprocessing queues on macOS
+        return None
+
+
+def _timed(
+    fn: Callable[..., None], on_done: Callable[[float], None]
+) -> Callable[..., None]:
+    def timed_fn(*args: Any, **kwargs: Any) -> None:
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        on_done(time.perf_counter() - start)
+
+    return timed_fn
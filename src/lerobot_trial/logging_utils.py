@@ -0,0 +1,28 @@
+"""Logging setup for nodes that do not otherwise need LeRobot."""
+
+import logging
+from datetime import datetime
+
+
+class _LeRobotLikeFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        dt = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        fnameline = f"{record.pathname}:{record.lineno}"
+        return f"{record.levelname} {dt} {fnameline[-15:]:>15} {record.getMessage()}"
+
+
+def init_logging(level: int = logging.INFO) -> None:
+    """Same output as `lerobot.utils.utils.init_logging` without importing LeRobot.
+
+    Importing LeRobot loads PyTorch, which takes seconds on every node startup.
+    """
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(_LeRobotLikeFormatter())
+    handler.setLevel(level)
+
+    logger = logging.getLogger()
+    logger.setLevel(logging.NOTSET)
+    for h in logger.handlers[:]:
+        logger.removeHandler(h)
+    logger.addHandler(handler)
@@ -0,0 +1,150 @@
+"""Utilities to run a trained policy outside of LeRobot's record loop."""
+
+from pathlib import Path
+from typing import Any
+
+import torch
+from lerobot.configs.policies import PreTrainedConfig
+from lerobot.datasets.utils import build_dataset_frame
+from lerobot.policies.factory import get_policy_class, make_pre_post_processors
+from lerobot.policies.pretrained import PreTrainedPolicy
+from lerobot.processor import RobotAction, RobotObservation
+from lerobot.utils.control_utils import predict_action
+
+from .cpu_inference import CpuInferenceConfig, optimize_policy_for_cpu
+
+
+def load_policy(
+    model_dir: Path,
+    device: str,
+    cpu_inference: CpuInferenceConfig | None = None,
+) -> tuple[PreTrainedPolicy, Any, Any]:
+    """Loads a policy and its pre/post-processors from a `pretrained_model` dir."""
+
+    config = PreTrainedConfig.from_pretrained(model_dir)
+    config.device = device  # Override the device used for training (e.g., mps).
+
+    policy = get_policy_class(config.type).from_pretrained(model_dir, config=config)
+    policy.eval()
+
+    if cpu_inference is not None and device == "cpu":
+        optimize_policy_for_cpu(policy, cpu_inference)
+
+    preprocessor, postprocessor = make_pre_post_processors(
+        policy_cfg=config,
+        pretrained_path=str(model_dir),
+        preprocessor_overrides={"device_processor": {"device": device}},
+    )
+    return policy, preprocessor, postprocessor
+
+
+def make_policy_batch(
+    observation_frame: dict[str, Any], task: str, robot_type: str
+) -> dict[str, Any]:
+    """Converts an observation frame into a batch of one, as `predict_action` does.
+
+    Images are converted from HWC uint8 into CHW float in [0, 1].
+    """
+
+    batch: dict[str, Any] = {}
+    for key, value in observation_frame.items():
+        tensor = torch.from_numpy(value)
+        if "image" in key:
+            tensor = tensor.type(torch.float32) / 255
+            tensor = tensor.permute(2, 0, 1).contiguous()
+        batch[key] = tensor.unsqueeze(0)
+
+    batch["task"] = task
+    batch["robot_type"] = robot_type
+    return batch
+
+
+class PolicyInputBuffers:
+    """Preallocated policy inputs refilled every step, like `make_policy_batch`.
+
+    Images are converted into CHW float in [0, 1] directly on the device.
+    """
+
+    def __init__(self) -> None:
+        self._buffers: dict[str, torch.Tensor] = {}
+        self._device: torch.device | None = None
+
+    def make_batch(
+        self,
+        observation_frame: dict[str, Any],
+        task: str,
+        robot_type: str,
+        device: torch.device,
+    ) -> dict[str, Any]:
+        if device != self._device:
+            self._buffers.clear()
+            self._device = device
+
+        batch: dict[str, Any] = {}
+        for key, value in observation_frame.items():
+            source = torch.from_numpy(value)
+            if "image" in key:
+                source = source.permute(2, 0, 1)
+
+            buffer = self._get_buffer(key, source.shape)
+            buffer[0].copy_(source)  # Also converts dtype and device
+            if "image" in key:
+                buffer.div_(255)
+            batch[key] = buffer
+
+        batch["task"] = task
+        batch["robot_type"] = robot_type
+        return batch
+
+    def owns(self, tensor: torch.Tensor) -> bool:
+        return any(tensor.data_ptr() == b.data_ptr() for b in self._buffers.values())
+
+    def _get_buffer(self, key: str, shape: torch.Size) -> torch.Tensor:
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.shape[1:] != shape:
+            buffer = torch.empty((1, *shape), dtype=torch.float32, device=self._device)
+            self._buffers[key] = buffer
+        return buffer
+
+
+class PolicyController:
+    """Controller that queries a policy in the same way as LeRobot's record loop."""
+
+    def __init__(
+        self,
+        model_dir: Path,
+        device: str,
+        dataset_features: dict[str, dict[str, Any]],
+        task: str,
+        robot_type: str,
+        cpu_inference: CpuInferenceConfig | None = None,
+    ) -> None:
+        self._policy, self._preprocessor, self._postprocessor = load_policy(
+            model_dir, device, cpu_inference
+        )
+        self._device = torch.device(device)
+        self._dataset_features = dataset_features
+        self._task = task
+        self._robot_type = robot_type
+
+    def reset(self) -> None:
+        self._policy.reset()
+        self._preprocessor.reset()
+        self._postprocessor.reset()
+
+    def __call__(self, observation: RobotObservation) -> RobotAction:
+        observation_frame = build_dataset_frame(
+            self._dataset_features, observation, prefix="observation"
+        )
+        action_values = predict_action(
+            observation_frame,
+            self._policy,
+            self._device,
+            self._preprocessor,
+            self._postprocessor,
+            use_amp=False,
+            task=self._task,
+            robot_type=self._robot_type,
+        )
+        names = self._dataset_features["action"]["names"]
+        return {name: float(v) for name, v in zip(names, action_values.tolist())}
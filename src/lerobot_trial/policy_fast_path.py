@@ -0,0 +1,80 @@
+"""Fast path from observations to policy inputs in LeRobot's record loop.
+
+By default, the record loop restacks per-scalar state values into a vector and
+converts images into new tensors every step. With robots handing over
+`StackedObservation`s, the state vector is taken as is, and inputs are written
+into preallocated tensors instead.
+"""
+
+from contextlib import nullcontext
+from typing import Any
+
+import lerobot.scripts.lerobot_record as lsr
+import torch
+from lerobot.datasets.utils import build_dataset_frame
+from lerobot.policies.pretrained import PreTrainedPolicy
+
+from .hw_impl.base_robot import BaseRobot
+from .hw_impl.common import StackedObservation
+from .policy import PolicyInputBuffers
+
+OBS_PREFIX = "observation"
+
+
+def build_stacked_dataset_frame(
+    ds_features: dict[str, dict[str, Any]], values: Any, prefix: str
+) -> dict[str, Any]:
+    """Same as `build_dataset_frame`, but takes stacked state vectors as they are."""
+
+    if prefix != OBS_PREFIX or not isinstance(values, StackedObservation):
+        return build_dataset_frame(ds_features, values, prefix)
+
+    frame: dict[str, Any] = {}
+    for key, ft in ds_features.items():
+        if not key.startswith(prefix):
+            continue
+        if ft["dtype"] in ["image", "video"]:
+            frame[key] = values.images[key.removeprefix(f"{prefix}.images.")]
+        elif ft["names"] == values.state_names:
+            frame[key] = values.state
+        else:
+            frame[key] = build_dataset_frame({key: ft}, values, prefix)[key]
+    return frame
+
+
+def install_policy_fast_path() -> None:
+    """Makes LeRobot's record loop use the fast path for policy inputs."""
+
+    buffers = PolicyInputBuffers()
+
+    def predict_action_with_buffers(
+        observation: dict[str, Any],
+        policy: PreTrainedPolicy,
+        device: torch.device,
+        preprocessor: Any,
+        postprocessor: Any,
+        use_amp: bool,
+        task: str | None = None,
+        robot_type: str | None = None,
+    ) -> torch.Tensor:
+        autocast = (
+            torch.autocast(device_type=device.type)
+            if device.type == "cuda" and use_amp
+            else nullcontext()
+        )
+        with torch.inference_mode(), autocast:
+            batch = buffers.make_batch(
+                observation, task or "", robot_type or "", device
+            )
+            batch = preprocessor(batch)
+            # Policies may keep inputs across steps, which must not be overwritten.
+            batch = {
+                k: v.clone() if isinstance(v, torch.Tensor) and buffers.owns(v) else v
+                for k, v in batch.items()
+            }
+            action = policy.select_action(batch)
+            return postprocessor(action)  # type: ignore[no-any-return]
+
+    BaseRobot.stack_observations = True
+    lsr.build_dataset_frame = build_stacked_dataset_frame
+    lsr.predict_action = predict_action_with_buffers
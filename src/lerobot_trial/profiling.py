@@ -0,0 +1,191 @@
+"""Opt-in profiling of a node, enabled by environment variables.
+
+With `PROFILE=sampling`, stacks of all threads are sampled periodically, which
+is cheap enough for production-like sessions. With `PROFILE=cprofile`, the main
+thread is also traced by cProfile for exact call counts. In both modes, a
+pstats file (readable by `pstats`, snakeviz, etc.) and a collapsed-stack file
+(readable by flamegraph.pl, speedscope, etc.) are written on exit.
+"""
+
+import cProfile
+import logging
+import marshal
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Identifies a function as pstats does: (filename, first line number, name)
+type FuncKey = tuple[str, int, str]
+
+
+class ProfileMode(str, Enum):
+    SAMPLING = "sampling"
+    CPROFILE = "cprofile"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@dataclass
+class ProfileConfig:
+    mode: ProfileMode = ProfileMode.SAMPLING
+    output_dir: Path = Path("outputs/profile")
+    interval_s: float = 0.01  # Between samples
+    # Sampling window from the start; the whole run if `duration_s` is None.
+    # cProfile always covers the whole run.
+    delay_s: float = 0.0
+    duration_s: float | None = None
+
+    @classmethod
+    def from_env(cls) -> "ProfileConfig | None":
+        """Reads `PROFILE*` environment variables; `None` if disabled."""
+
+        if not (mode := os.environ.get("PROFILE")):
+            return None
+
+        config = cls(mode=ProfileMode(mode))
+        if output_dir := os.environ.get("PROFILE_DIR"):
+            config.output_dir = Path(output_dir)
+        if interval_ms := os.environ.get("PROFILE_INTERVAL_MS"):
+            config.interval_s = float(interval_ms) / 1e3
+        if delay_s := os.environ.get("PROFILE_DELAY"):
+            config.delay_s = float(delay_s)
+        if duration_s := os.environ.get("PROFILE_DURATION"):
+            config.duration_s = float(duration_s)
+        return config
+
+
+class SamplingProfiler:
+    """Samples stacks of all threads but itself in a background thread."""
+
+    def __init__(self, config: ProfileConfig) -> None:
+        self._config = config
+        # Sample counts per (thread name, stack from the root)
+        self.samples: Counter[tuple[str, tuple[FuncKey, ...]]] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path: Path) -> None:
+        with open(path, "w") as f:
+            for (thread_name, stack), count in self.samples.most_common():
+                frames = ";".join([thread_name, *(_label(k) for k in stack)])
+                f.write(f"{frames} {count}\n")
+
+    def write_pstats(self, path: Path) -> None:
+        """Writes sampled time in the format of `cProfile.Profile.dump_stats`.
+
+        Sample counts stand in for call counts, which sampling cannot observe.
+        """
+
+        dt = self._config.interval_s
+        stats: dict[FuncKey, list[Any]] = defaultdict(lambda: [0, 0, 0.0, 0.0, {}])
+        for (_thread_name, stack), count in self.samples.items():
+            if not stack:
+                continue
+
+            stats[stack[-1]][2] += count * dt  # Own time of the leaf
+            # Recursive functions appear once per sample in cumulative time.
+            for func in set(stack):
+                stats[func][0] += count
+                stats[func][1] += count
+                stats[func][3] += count * dt
+
+            for caller, callee in set(zip(stack[:-1], stack[1:])):
+                callers = stats[callee][4]
+                nc, cc, tt, ct = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (nc + count, cc + count, tt, ct + count * dt)
+
+        with open(path, "wb") as f:
+            marshal.dump({k: tuple(v) for k, v in stats.items()}, f)
+
+    def _run(self) -> None:
+        if self._stop.wait(self._config.delay_s):
+            return
+
+        end = time.monotonic() + (self._config.duration_s or float("inf"))
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self._config.interval_s):
+            if time.monotonic() > end:
+                logger.info("Sampling window ended.")
+                return
+
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    thread_name = names.get(ident, str(ident))
+                    self.samples[(thread_name, _stack(frame))] += 1
+
+
+@contextmanager
+def profile_node(node: str) -> Iterator[None]:
+    """Profiles the enclosed block if enabled, writing files under `PROFILE_DIR`."""
+
+    if (config := ProfileConfig.from_env()) is None:
+        yield
+        return
+
+    # Dora terminates nodes that do not stop in time; exit cleanly to write files.
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    sampler = SamplingProfiler(config)
+    tracer = cProfile.Profile() if config.mode == ProfileMode.CPROFILE else None
+
+    logger.info(f"Profiling {node} node ({config.mode})...")
+    sampler.start()
+    if tracer is not None:
+        tracer.enable()
+    try:
+        yield
+    finally:
+        if tracer is not None:
+            tracer.disable()
+        sampler.stop()
+
+        config.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{node}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        pstats_path = config.output_dir / f"{stem}.pstats"
+        collapsed_path = config.output_dir / f"{stem}.collapsed"
+
+        if tracer is not None:
+            tracer.dump_stats(pstats_path)
+        else:
+            sampler.write_pstats(pstats_path)
+        sampler.write_collapsed(collapsed_path)
+        logger.info(f"Profile written to {pstats_path} and {collapsed_path}")
+
+
+def _stack(frame: FrameType | None) -> tuple[FuncKey, ...]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+def _label(func: FuncKey) -> str:
+    filename, lineno, name = func
+    # Semicolons separate frames in collapsed stacks.
+    return f"{name} ({Path(filename).name}:{lineno})".replace(";", ":")
@@ -0,0 +1,62 @@
+"""Truncation of recorded frames when the environment is rewound."""
+
+import logging
+from typing import Any
+
+import numpy as np
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+
+from .episode_buffer import drop_buffered_frames
+from .gym_client import GymClient
+
+logger = logging.getLogger(__name__)
+
+
+def truncate_rewound_frames(dataset: LeRobotDataset, client: GymClient) -> int:
+    """Drops buffered frames observed at or after the time rewound to.
+
+    This must be called right before adding the frame whose observation was
+    obtained last, which is not in the buffer yet. Returns the number of
+    dropped frames.
+    """
+
+    rewind_to = client.pending_rewind
+    client.pending_rewind = None
+
+    buffer = dataset.episode_buffer
+    if rewind_to is None or buffer is None or buffer["size"] == 0:
+        return 0
+
+    size: int = buffer["size"]
+    history = list(client.frame_history)
+    # The last entry is for the frame about to be added.
+    buffered = history[-(size + 1) : -1]
+    if len(buffered) < size:
+        logger.warning("Frame history is too short to truncate rewound frames.")
+        return 0
+
+    keep = np.array([meta.seq < rewind_to for meta in buffered])
+    num_dropped = int((~keep).sum())
+    if num_dropped > 0:
+        drop_buffered_frames(dataset, keep)
+        kept = [meta for meta, k in zip(buffered, keep) if k]
+        client.frame_history.clear()
+        client.frame_history.extend(history[: -(size + 1)] + kept + history[-1:])
+
+    return num_dropped
+
+
+def install_rewind_truncation(client: GymClient) -> None:
+    """Makes `LeRobotDataset.add_frame` truncate rewound frames beforehand."""
+
+    add_frame = LeRobotDataset.add_frame
+
+    def add_frame_after_rewind(
+        self: LeRobotDataset, frame: dict[str, Any], *args: Any, **kwargs: Any
+    ) -> None:
+        if client.pending_rewind is not None:
+            num_dropped = truncate_rewound_frames(self, client)
+            logger.info(f"Dropped {num_dropped} frames after the rewound time.")
+        add_frame(self, frame, *args, **kwargs)
+
+    LeRobotDataset.add_frame = add_frame_after_rewind  # type: ignore[method-assign]
@@ -0,0 +1,179 @@
+"""Headless rollouts in the Gym-HIL environment without Dora."""
+
+import multiprocessing as mp
+import shutil
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+import numpy as np
+from lerobot.datasets.dataset_tools import merge_datasets
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import build_dataset_frame, hw_to_dataset_features
+from lerobot.processor import RobotAction, RobotObservation
+from lerobot.utils.utils import init_logging
+
+from .actions import ActionDim, make_action_array
+from .config import COMMON_CONFIG
+from .gym_hil import AbsolutePositionControl
+from .hw_impl.common import make_observation_features, make_observations
+
+type StepCallback = Callable[[RobotObservation, RobotAction], None]
+# Runs episodes of the given seeds in a worker with the given index.
+type Worker[T] = Callable[[int, list[int]], list[T]]
+
+
+class Controller(Protocol):
+    """Anything that maps a robot observation to an action, episode by episode."""
+
+    def reset(self) -> None: ...
+
+    def __call__(self, observation: RobotObservation) -> RobotAction: ...
+
+
+@dataclass
+class EpisodeResult:
+    seed: int
+    success: bool = False
+    length: int = 0
+    inference_times: list[float] = field(default_factory=list)
+    sim_times: list[float] = field(default_factory=list)
+
+
+def make_dataset_features(
+    env: AbsolutePositionControl, use_videos: bool = True
+) -> dict[str, dict[str, Any]]:
+    """Makes dataset features compatible with `GymHILRecorderRobot`."""
+
+    observation_features = make_observation_features(env.observation_space)
+    action_features = {str(dim): float for dim in ActionDim}
+    return {
+        **hw_to_dataset_features(action_features, "action", use_videos),
+        **hw_to_dataset_features(observation_features, "observation", use_videos),
+    }
+
+
+def run_episode(
+    env: AbsolutePositionControl,
+    controller: Controller,
+    seed: int,
+    max_steps: int,
+    on_step: StepCallback | None = None,
+) -> EpisodeResult:
+    """Runs a single episode until success, termination or `max_steps`.
+
+    `on_step` is called with the observation at time t and the action chosen
+    for it, i.e., in the same order as LeRobot records frames.
+    """
+
+    # Gym-HIL samples block positions from NumPy's global RNG.
+    np.random.seed(seed)
+    obs, _info = env.reset(seed=seed)
+    controller.reset()
+
+    result = EpisodeResult(seed=seed)
+    while result.length < max_steps:
+        observation = make_observations(obs)
+
+        start = time.perf_counter()
+        action = controller(observation)
+        result.inference_times.append(time.perf_counter() - start)
+
+        if on_step is not None:
+            on_step(observation, action)
+
+        start = time.perf_counter()
+        obs, reward, terminated, truncated, _info = env.step(make_action_array(action))
+        result.sim_times.append(time.perf_counter() - start)
+
+        result.length += 1
+
+        # Sparse reward is given only when the task succeeds.
+        if float(reward) > 0.0:
+            result.success = True
+        if terminated or truncated:
+            break
+
+    return result
+
+
+def create_dataset(
+    repo_id: str,
+    root: Path,
+    features: dict[str, dict[str, Any]],
+    robot_type: str,
+    image_writer_threads: int = 4,
+) -> LeRobotDataset:
+    return LeRobotDataset.create(
+        repo_id=repo_id,
+        fps=COMMON_CONFIG.fps,
+        root=root,
+        robot_type=robot_type,
+        features=features,
+        use_videos=True,
+        image_writer_threads=image_writer_threads,
+    )
+
+
+def add_dataset_frame(
+    dataset: LeRobotDataset,
+    observation: RobotObservation,
+    action: RobotAction,
+    task: str,
+) -> None:
+    frame = {
+        **build_dataset_frame(dataset.features, observation, prefix="observation"),
+        **build_dataset_frame(dataset.features, action, prefix="action"),
+        "task": task,
+    }
+    dataset.add_frame(frame)
+
+
+def merge_dataset_shards(
+    shard_roots: list[Path], repo_id: str, root: Path
+) -> LeRobotDataset:
+    """Merges datasets written by parallel workers and removes the shards."""
+
+    shards = [LeRobotDataset(repo_id=repo_id, root=r) for r in shard_roots]
+    merged = merge_datasets(shards, output_repo_id=repo_id, output_dir=root)
+
+    for shard_root in shard_roots:
+        shutil.rmtree(shard_root)
+
+    return merged
+
+
+def split_seeds(seed: int, num_episodes: int, num_workers: int) -> list[list[int]]:
+    """Splits seeds of episodes among at most `num_workers` workers.
+
+    Static partitioning lets each worker own a dataset shard until it finishes.
+    """
+
+    seeds = [seed + i for i in range(num_episodes)]
+    num_workers = max(1, min(num_workers, len(seeds)))
+    return [seeds[i::num_workers] for i in range(num_workers)]
+
+
+def dataset_shard_root(root: Path, worker_index: int) -> Path:
+    """Path to the dataset shard of a worker, next to the merged one at `root`."""
+    return root.parent / f"{root.name}_shards" / f"worker_{worker_index:02d}"
+
+
+def run_workers[T](worker: Worker[T], worker_seeds: list[list[int]]) -> list[list[T]]:
+    """Runs `worker` in a process per element of `worker_seeds`.
+
+    `worker` must be picklable, e.g., a module-level function or its partial.
+    Results are returned in the order of the workers.
+    """
+
+    # MuJoCo and PyTorch are not fork-safe once initialized.
+    with ProcessPoolExecutor(
+        len(worker_seeds),
+        mp_context=mp.get_context("spawn"),
+        initializer=init_logging,
+    ) as pool:
+        futures = [pool.submit(worker, i, s) for i, s in enumerate(worker_seeds)]
+        return [f.result() for f in futures]
@@ -0,0 +1,72 @@
+"""Bounded ring of simulation snapshots to rewind an episode partially."""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from .actions import ActionDim
+from .gym_hil import AbsolutePositionControl, SimState
+
+
+@dataclass
+class Snapshot:
+    seq: int  # `seq` of the episode message that carried `observation`
+    state: SimState
+    action: dict[ActionDim, float]  # Action that resulted in `observation`
+    observation: dict[str, Any]
+    done: bool
+
+
+class SnapshotRing:
+    def __init__(self, interval: int, capacity: int) -> None:
+        """Keeps at most `capacity` snapshots taken every `interval` ticks."""
+
+        self._interval = interval
+        self._snapshots: deque[Snapshot] = deque(maxlen=capacity)
+        self._ticks_since_capture = 0
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def tick(
+        self,
+        seq: int,
+        env: AbsolutePositionControl,
+        action: dict[ActionDim, float],
+        observation: dict[str, Any],
+        done: bool,
+    ) -> None:
+        """Takes a snapshot after a step if `interval` ticks have passed."""
+
+        self._ticks_since_capture += 1
+        if self._ticks_since_capture < self._interval:
+            return
+
+        self._ticks_since_capture = 0
+        snapshot = Snapshot(
+            seq=seq,
+            state=env.capture_state(),
+            action=dict(action),
+            # Observations are freshly allocated by each step, so no need to copy.
+            observation=observation,
+            done=done,
+        )
+        self._snapshots.append(snapshot)
+
+    def rewind(self, env: AbsolutePositionControl) -> Snapshot | None:
+        """Restores the latest snapshot into `env` and discards it.
+
+        Repeated rewinds thus go back further, one snapshot at a time.
+        """
+
+        if not self._snapshots:
+            return None
+
+        snapshot = self._snapshots.pop()
+        env.restore_state(snapshot.state)
+        self._ticks_since_capture = 0
+        return snapshot
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._ticks_since_capture = 0
@@ -0,0 +1,47 @@
+"""Standby environment reset in the background to make episode resets instant.
+
+The active environment cannot simply be replaced, since the MuJoCo viewer is
+bound to its model and data. Instead, a headless twin in a worker process is
+reset ahead of time, and its resulting state is restored into the active one.
+"""
+
+import multiprocessing as mp
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from .gym_hil import AbsolutePositionControl, SimState, make_env
+
+_standby_env: AbsolutePositionControl | None = None
+
+
+def _init_standby_env() -> None:
+    global _standby_env
+    _standby_env = make_env(headless=True)
+
+
+def _reset_standby_env() -> SimState:
+    assert _standby_env is not None, "Standby environment is not initialized."
+    _standby_env.reset()
+    return _standby_env.capture_state()
+
+
+class StandbyEnv:
+    def __init__(self) -> None:
+        # MuJoCo rendering contexts are not fork-safe.
+        self._executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_standby_env,
+        )
+        self._next_state: Future[SimState] = self._executor.submit(_reset_standby_env)
+
+    def swap_into(self, env: AbsolutePositionControl) -> None:
+        """Resets `env` to the pre-reset state and starts preparing the next one.
+
+        This blocks only if the standby has not finished resetting yet.
+        """
+
+        env.restore_state(self._next_state.result())
+        self._next_state = self._executor.submit(_reset_standby_env)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
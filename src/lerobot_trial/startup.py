@@ -0,0 +1,23 @@
+"""Startup timestamps of nodes, collected by `scripts/benchmark_startup.py`."""
+
+import json
+import os
+import time
+
+# If set, each node appends the time it handles its first message to this file.
+STARTUP_REPORT_ENV = "STARTUP_REPORT_FILE"
+
+_reported = False
+
+
+def report_first_message(node: str) -> None:
+    """Records the first call per process; later calls are no-ops."""
+
+    global _reported
+    if _reported:
+        return
+    _reported = True
+
+    if path := os.environ.get(STARTUP_REPORT_ENV):
+        with open(path, "a") as f:
+            f.write(json.dumps({"node": node, "time": time.time()}) + "\n")
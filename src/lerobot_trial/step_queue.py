@@ -0,0 +1,100 @@
+"""Bounded queue of sequence-numbered steps received on the episode channel."""
+
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+
+from .gym_utils import StepIO
+
+logger = logging.getLogger(__name__)
+
+
+class QueuePolicy(str, Enum):
+    # Hand over every step; the oldest ones are dropped if the queue overflows.
+    DROP_OLDEST = "drop_oldest"
+    # Always hand over the latest step, dropping older ones.
+    LATEST = "latest"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@dataclass
+class StreamStats:
+    received: int = 0
+    consumed: int = 0
+    gaps: int = 0  # Steps never received, detected by jumps in `seq`
+    dropped: int = 0  # Steps received but discarded as the consumer fell behind
+    flushed: int = 0  # Steps discarded intentionally, e.g., at episode boundaries
+    duplicates: int = 0  # Times no new step was available to hand over
+    high_water_mark: int = 0  # Maximum number of steps waiting in the queue
+
+    def __str__(self) -> str:
+        return ", ".join(f"{k}={v}" for k, v in vars(self).items())
+
+
+class StepQueue:
+    def __init__(self, max_size: int, policy: QueuePolicy) -> None:
+        if max_size < 1:
+            raise ValueError(f"Step queue size must be at least 1: {max_size}")
+
+        self.stats = StreamStats()
+        self._max_size = max_size
+        self._policy = policy
+        self._steps: deque[StepIO] = deque()
+        self._last_seq: int | None = None
+
+    @classmethod
+    def from_env(cls) -> "StepQueue":
+        """Reads `STEP_QUEUE_SIZE` and `STEP_QUEUE_POLICY` environment variables."""
+        return cls(
+            max_size=int(os.environ.get("STEP_QUEUE_SIZE", "20")),
+            policy=QueuePolicy(os.environ.get("STEP_QUEUE_POLICY", "drop_oldest")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def put(self, step: StepIO) -> None:
+        if self._last_seq is not None and step.seq > self._last_seq + 1:
+            missing = step.seq - self._last_seq - 1
+            logger.warning(f"Missed {missing} steps before seq={step.seq}.")
+            self.stats.gaps += missing
+        self._last_seq = step.seq
+        self.stats.received += 1
+
+        self._steps.append(step)
+        self.stats.high_water_mark = max(self.stats.high_water_mark, len(self))
+
+        if len(self) > self._max_size:
+            logger.warning(f"Step queue overflowed ({self._max_size} steps).")
+            self.stats.dropped += self._drop_oldest(len(self) - self._max_size)
+
+    def get(self, latest: bool = False) -> StepIO | None:
+        """Pops the next step to hand over, or `None` if there is none.
+
+        If `latest` is True, the latest step is popped regardless of the policy.
+        """
+
+        if not self._steps:
+            return None
+
+        if latest or self._policy == QueuePolicy.LATEST:
+            self.stats.dropped += self._drop_oldest(len(self) - 1)
+
+        self.stats.consumed += 1
+        return self._steps.popleft()
+
+    def flush(self) -> None:
+        """Drops all but the latest step, e.g., when starting a new episode."""
+        self.stats.flushed += self._drop_oldest(len(self) - 1)
+
+    def _drop_oldest(self, count: int) -> int:
+        for _ in range(max(0, count)):
+            dropped = self._steps.popleft()
+            # Never lose a rewind, which recorded frames must follow.
+            if dropped.rewind_to is not None and self._steps[0].rewind_to is None:
+                self._steps[0].rewind_to = dropped.rewind_to
+        return max(0, count)
@@ -9,6 +9,17 @@ from lerobot.utils.utils import init_logging
 
 import lerobot_trial.hw_impl  # noqa: F401
 from lerobot_trial import COMMON_CONFIG, DoraEventStreamClosed, lerobot_control_events
+from lerobot_trial.cpu_inference import CpuInferenceConfig, optimize_policy_for_cpu
+from lerobot_trial.gym_client import GymClient
+from lerobot_trial.idle_frames import IdleTrimConfig, install_idle_frame_trimming
+from lerobot_trial.image_io import (
+    IOMonitorConfig,
+    install_adaptive_image_writer,
+    install_io_monitoring,
+)
+from lerobot_trial.policy_fast_path import install_policy_fast_path
+from lerobot_trial.profiling import profile_node
+from lerobot_trial.rewind import install_rewind_truncation
 
 
 @parser.wrap()  # type: ignore[misc]
@@ -35,11 +46,48 @@ def main(cfg: RecordConfig) -> None:
     # Disable LeRobot's keyboard listener not to conflict with ours.
     lsr.init_keyboard_listener = lambda: (None, lerobot_control_events)
 
+    # Optionally optimize the policy for CPU-only evaluation hosts.
+    cpu_inference = CpuInferenceConfig.from_env()
+    if cpu_inference.enabled and cfg.policy is not None:
+        if cfg.policy.device != "cpu":
+            raise ValueError("CPU_INFERENCE requires `--policy.device=cpu`.")
+
+        make_policy = lsr.make_policy
+        lsr.make_policy = lambda *args, **kwargs: optimize_policy_for_cpu(
+            make_policy(*args, **kwargs), cpu_inference
+        )
+
+    # Take stacked observations as they are and reuse input tensors for policies.
+    if cfg.policy is not None and os.environ.get("POLICY_FAST_PATH", "1") != "0":
+        install_policy_fast_path()
+
+    # Drop frames recorded after the time the environment is rewound to.
+    client = GymClient()
+    install_rewind_truncation(client)
+
+    # Drop idle/frozen frames at both ends of each episode before saving it.
+    if trim_config := IdleTrimConfig.from_env():
+        install_idle_frame_trimming(
+            lambda: bool(client.frame_history) and client.frame_history[-1].done,
+            trim_config,
+        )
+
+    # Size the image writer for the cameras and cores rather than fixed defaults.
+    if os.environ.get("IMAGE_WRITER_SIZING", "auto") == "auto":
+        install_adaptive_image_writer(cfg.dataset)
+
+    # Watch the image writer not to let queued frames exhaust memory.
+    if io_config := IOMonitorConfig.from_env():
+        install_io_monitoring(io_config)
+
     try:
         record(cfg)
     except DoraEventStreamClosed:
         logging.info("Dora event stream closed. Exiting...")
+    finally:
+        logging.info(f"Episode stream: {client.stats}")
 
 
 if __name__ == "__main__":
-    main()
+    with profile_node("lerobot"):
+        main()
@@ -1,17 +1,24 @@
 import logging
+import os
 import time
 from enum import Enum
 
 from dora import Node
-from lerobot.utils.utils import init_logging
 
+from lerobot_trial.actions import init_action, make_action_array
 from lerobot_trial.dora_ch import (
     ChannelId,
     ControlCmd,
+    make_dict_message,
     parse_single_value_in_event,
 )
-from lerobot_trial.gym_hil import init_action, make_action_array, make_env
+from lerobot_trial.gym_hil import make_env
 from lerobot_trial.gym_utils import step_io_to_message
+from lerobot_trial.logging_utils import init_logging
+from lerobot_trial.profiling import profile_node
+from lerobot_trial.sim_snapshots import SnapshotRing
+from lerobot_trial.standby_env import StandbyEnv
+from lerobot_trial.startup import report_first_message
 
 
 class State(int, Enum):
@@ -27,13 +34,23 @@ def main() -> None:
     node = Node()
 
     env = make_env(headless=False)
+    # Optionally reset a standby env in the background to make resets instant.
+    standby = StandbyEnv() if os.environ.get("STANDBY_RESET") else None
+    # Snapshots to rewind the current episode partially (by default, every 1 sec
+    # for the last 30 secs).
+    snapshots = SnapshotRing(
+        interval=int(os.environ.get("SNAPSHOT_INTERVAL", "10")),
+        capacity=int(os.environ.get("SNAPSHOT_CAPACITY", "30")),
+    )
 
     _obs, _info = env.reset()
     action = init_action()
     countdown_to_reset = None
+    reset_secs = None  # To measure time from reset to the first frame
 
     state = State.BEFORE_DONE
     action_recv_count = 0
+    seq = 0  # Index of messages on the episode channel
 
     for event in node:
         match (event["type"], event.get("id")):
@@ -42,15 +59,29 @@ def main() -> None:
 
                 env_action = make_action_array(action)
                 obs, _reward, terminated, truncated, _info = env.step(env_action)
-                output = step_io_to_message(action, obs)
-                node.send_output(ChannelId.EPISODE, output)
-
-                logging.debug(f"Step took {time.perf_counter() - start:.4f} secs.")
 
                 if state == State.BEFORE_DONE and (terminated or truncated):
                     logging.info(f"Done: {terminated=}, {truncated=}")
                     state = State.AFTER_DONE
 
+                done = state == State.AFTER_DONE
+                seq += 1
+                output = step_io_to_message(action, obs, seq=seq, done=done)
+                node.send_output(ChannelId.EPISODE, output)
+                report_first_message("gym-hil")
+
+                if state != State.RESETTING:
+                    snapshots.tick(seq, env, action, obs, done)
+
+                step_secs = time.perf_counter() - start
+                logging.debug(f"Step took {step_secs:.4f} secs.")
+
+                if reset_secs is not None:
+                    # Excluding the wait for the tick, which is inherent.
+                    secs = reset_secs + step_secs
+                    logging.info(f"Reset to first frame took {secs:.4f} secs.")
+                    reset_secs = None
+
                 if countdown_to_reset is not None:
                     countdown_to_reset -= 1
 
@@ -65,11 +96,39 @@ def main() -> None:
                 action_recv_count += 1
 
             case ("INPUT", ChannelId.CONTROL):
-                if ControlCmd.from_event(event) == ControlCmd.ESC:
+                control = ControlCmd.from_event(event)
+                if control == ControlCmd.ESC:
                     logging.info("Closing environment...")
                     break
 
-                if state == State.RESETTING:
+                if control == ControlCmd.BACKSPACE:
+                    if state == State.RESETTING:
+                        continue
+
+                    snapshot = snapshots.rewind(env)
+                    if snapshot is None:
+                        logging.warning("No snapshot to rewind to.")
+                        continue
+
+                    logging.info(f"Rewound to seq={snapshot.seq}.")
+                    action = dict(snapshot.action)
+                    state = State.AFTER_DONE if snapshot.done else State.BEFORE_DONE
+                    action_recv_count = 0
+
+                    # Resend the observation at the rewound time to the recorder,
+                    # and the action at that time to the controller.
+                    seq += 1
+                    output = step_io_to_message(
+                        action,
+                        snapshot.observation,
+                        seq=seq,
+                        done=snapshot.done,
+                        rewind_to=snapshot.seq,
+                    )
+                    node.send_output(ChannelId.EPISODE, output)
+                    node.send_output(ChannelId.REWIND, make_dict_message(action))
+
+                elif state == State.RESETTING:
                     logging.info("Entering the next episode...")
                     state = State.BEFORE_DONE
                     action_recv_count = 0
@@ -86,12 +145,21 @@ def main() -> None:
 
         if countdown_to_reset == 0:
             logging.info("Resetting environment...")
-            _obs, _info = env.reset()
+            start = time.perf_counter()
+            if standby is not None:
+                standby.swap_into(env)
+            else:
+                _obs, _info = env.reset()
+            reset_secs = time.perf_counter() - start
             action = init_action()
             countdown_to_reset = None
+            snapshots.clear()
 
+    if standby is not None:
+        standby.close()
     env.close()
 
 
 if __name__ == "__main__":
-    main()
+    with profile_node("gym-hil"):
+        main()
@@ -4,22 +4,26 @@ from typing import Any
 
 import pyarrow as pa
 from dora import Node
-from lerobot.utils.utils import init_logging
 from pynput.keyboard import Key, Listener
 
+from lerobot_trial.actions import KEY_STEP_SIZE, ActionDim, init_action
 from lerobot_trial.dora_ch import (
     ChannelId,
     ControlCmd,
     is_timeout_event,
     make_dict_message,
+    parse_single_value_in_event,
     try_recv_event,
 )
-from lerobot_trial.gym_hil import ActionDim, init_action
+from lerobot_trial.logging_utils import init_logging
+from lerobot_trial.profiling import profile_node
+from lerobot_trial.startup import report_first_message
 
 CONTROL_KEY_MAP = {
     Key.esc: ControlCmd.ESC,
     Key.ctrl: ControlCmd.CTRL,
     Key.space: ControlCmd.SPACE,
+    Key.backspace: ControlCmd.BACKSPACE,
 }
 
 
@@ -27,9 +31,9 @@ class ActionState:
     def __init__(self) -> None:
         self._state = init_action()
         self._step_sizes = {
-            ActionDim.X: 0.005,
-            ActionDim.Y: 0.005,
-            ActionDim.Z: 0.005,
+            ActionDim.X: KEY_STEP_SIZE,
+            ActionDim.Y: KEY_STEP_SIZE,
+            ActionDim.Z: KEY_STEP_SIZE,
         }
         self._pressed_positive = {
             ActionDim.X: False,
@@ -45,6 +49,10 @@ class ActionState:
     def reset(self) -> None:
         self._state = init_action()
 
+    def restore(self, values: dict[str, float]) -> None:
+        """Restores the state, e.g., to the action at the time rewound to."""
+        self._state = {dim: float(values[dim]) for dim in ActionDim}
+
     def handle_key_event(self, key: Key, pressed: bool) -> None:
         if key == Key.up:
             self._pressed_positive[ActionDim.Y] = pressed
@@ -84,7 +92,9 @@ def main() -> None:
             command = CONTROL_KEY_MAP[key]
             with lock:
                 node.send_output(ChannelId.CONTROL, command.to_message())
-                action.reset()
+                # On rewinding, the action is restored by the simulator instead.
+                if command != ControlCmd.BACKSPACE:
+                    action.reset()
         else:
             with lock:
                 action.handle_key_event(key, pressed)
@@ -106,6 +116,10 @@ def main() -> None:
                     with lock:
                         output = action.tick_to_message()
                         node.send_output(ChannelId.ACTION, output)
+                    report_first_message("keyboard")
+                case ("INPUT", ChannelId.REWIND):
+                    with lock:
+                        action.restore(parse_single_value_in_event(event))
                 case ("STOP", _):
                     logging.info("Received stop signal from Dora.")
                 case _:
@@ -113,4 +127,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    with profile_node("keyboard"):
+        main()
@@ -0,0 +1,94 @@
+import unittest
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+import numpy as np
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+
+from lerobot_trial.idle_frames import (
+    ACTION_KEY,
+    DONE_KEY,
+    STATE_KEY,
+    IdleTrimConfig,
+    find_frames_to_keep,
+    install_idle_frame_trimming,
+)
+
+
+def make_frames(num_moving: int, num_frozen: int) -> tuple[np.ndarray, np.ndarray]:
+    """Frames moving by one step each, followed by frozen copies of the last."""
+
+    values = np.arange(num_moving, dtype=np.float32)
+    values = np.concatenate([values, np.full(num_frozen, values[-1])])
+    return values[:, None], values[:, None].copy()
+
+
+class FindFramesToKeepTest(unittest.TestCase):
+    def test_keeps_frames_until_done(self) -> None:
+        actions, states = make_frames(num_moving=10, num_frozen=5)
+        done = [False] * 8 + [True] * 7
+
+        keep, report = find_frames_to_keep(actions, states, done, IdleTrimConfig())
+
+        np.testing.assert_array_equal(keep, [True] * 9 + [False] * 6)
+        self.assertEqual(report.after_done, 6)
+
+    def test_rejects_misaligned_done_flags(self) -> None:
+        actions, states = make_frames(num_moving=10, num_frozen=0)
+
+        with self.assertRaises(ValueError):
+            find_frames_to_keep(actions, states, [False] * 9, IdleTrimConfig())
+
+
+class InstallIdleFrameTrimmingTest(unittest.TestCase):
+    def test_ignores_frames_observed_in_resetting_phase(self) -> None:
+        saved: list[dict[str, Any]] = []
+
+        def add_frame(self: Any, frame: dict[str, Any]) -> None:
+            buffer = self.episode_buffer
+            for key, val in frame.items():
+                buffer[key].append(val)
+            buffer["size"] += 1
+
+        def save_episode(self: Any, episode_data: Any = None) -> None:
+            saved.append(dict(self.episode_buffer))
+
+        dataset = SimpleNamespace(
+            episode_buffer={
+                "size": 0,
+                "episode_index": 0,
+                ACTION_KEY: [],
+                STATE_KEY: [],
+            },
+            image_writer=None,
+            features={},
+            fps=10,
+        )
+        # Done flags of all observations, as in `GymClient.frame_history`
+        history: list[bool] = []
+
+        with (
+            mock.patch.object(LeRobotDataset, "add_frame", add_frame),
+            mock.patch.object(LeRobotDataset, "save_episode", save_episode),
+        ):
+            install_idle_frame_trimming(lambda: history[-1], IdleTrimConfig())
+
+            # The task is done at frame 8, and frozen frames follow.
+            actions, states = make_frames(num_moving=10, num_frozen=5)
+            for i, (action, state) in enumerate(zip(actions, states)):
+                history.append(i >= 8)
+                LeRobotDataset.add_frame(
+                    dataset, {ACTION_KEY: action, STATE_KEY: state}
+                )
+
+            # Observations in the resetting phase are not recorded as frames.
+            history.extend([False] * 20)
+            LeRobotDataset.save_episode(dataset)
+
+        self.assertEqual(saved[0]["size"], 9)
+        self.assertNotIn(DONE_KEY, saved[0])
+
+
+if __name__ == "__main__":
+    unittest.main()